@@ -1,59 +1,77 @@
-import datetime
-import json
+import queue
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import List, Dict, Optional
 import tkinter.font as tkfont
 
-class TodoList:
-    def __init__(self):
-        self.tasks: List[Dict] = []
-        self.filename = "tasks.json"
-        self.load_tasks()
+from todo_list import TodoList
+from todo_storage import BackgroundWriter, JournalStorage
+
+ROW_HEIGHT = 64
+
+
+class TaskRow:
+    def __init__(self, app, canvas):
+        self.task_id = None
+        self.frame = ttk.Frame(canvas, style="Task.TFrame", height=ROW_HEIGHT - 4)
+        self.frame.pack_propagate(False)
+
+        self.completed_var = tk.BooleanVar()
+        completed_cb = ttk.Checkbutton(
+            self.frame,
+            variable=self.completed_var,
+            command=lambda: app.toggle_task_completion(self.task_id)
+        )
+        completed_cb.pack(side=tk.LEFT, padx=5)
+
+        delete_button = ttk.Button(
+            self.frame,
+            text="Delete",
+            command=lambda: app.delete_task(self.task_id)
+        )
+        delete_button.pack(side=tk.RIGHT, padx=5)
+
+        info_frame = ttk.Frame(self.frame, style="Task.TFrame")
+        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        self.title_label = ttk.Label(info_frame, style="TaskTitle.TLabel")
+        self.title_label.pack(anchor="w")
+        self.info_label = ttk.Label(info_frame, style="TaskInfo.TLabel")
+        self.info_label.pack(anchor="w")
+
+        self.item = canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+
+    def bind(self, task):
+        self.task_id = task["id"]
+        self.completed_var.set(task["completed"])
+        self.title_label.configure(text=task["title"])
+        info = [task["description"]] if task["description"] else []
+        if task["due_date"]:
+            info.append(f"Due: {task['due_date']}")
+        self.info_label.configure(text="   ".join(info))
+
+
+SAVE_DEBOUNCE = 0.25
+POLL_INTERVAL = 1000
 
-    def load_tasks(self) -> None:
-        try:
-            with open(self.filename, 'r') as f:
-                self.tasks = json.load(f)
-        except FileNotFoundError:
-            self.tasks = []
-
-    def save_tasks(self) -> None:
-        with open(self.filename, 'w') as f:
-            json.dump(self.tasks, f, indent=2)
-
-    def add_task(self, title: str, description: str = "", due_date: str = "") -> None:
-        task = {
-            "id": len(self.tasks) + 1,
-            "title": title,
-            "description": description,
-            "due_date": due_date,
-            "completed": False,
-            "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        self.tasks.append(task)
-        self.save_tasks()
-        return task
-
-    def complete_task(self, task_id: int) -> None:
-        for task in self.tasks:
-            if task["id"] == task_id:
-                task["completed"] = not task["completed"] 
-                self.save_tasks()
-                return
-                
-    def delete_task(self, task_id: int) -> None:
-        for i, task in enumerate(self.tasks):
-            if task["id"] == task_id:
-                self.tasks.pop(i)
-                self.save_tasks()
-                return
 
 class TodoApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, todo=None, save_debounce=SAVE_DEBOUNCE, poll_interval=POLL_INTERVAL):
         super().__init__()
 
-        self.todo = TodoList()
+        # The writer thread must never call into Tk; poll_changes drains this instead.
+        self.save_errors = queue.Queue()
+        if todo is None:
+            writer = BackgroundWriter(
+                JournalStorage("tasks.json"),
+                debounce=save_debounce,
+                on_error=self.save_errors.put
+            )
+            todo = TodoList(writer)
+        self.todo = todo
+        self.rows = []
+        self.total = 0
+        self.poll_interval = poll_interval
         
         self.title("To-Do List Manager")
         self.geometry("800x600")
@@ -70,6 +88,19 @@ class TodoApp(tk.Tk):
 
         self.create_widgets()
         self.refresh_tasks()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.poll_job = self.after(self.poll_interval, self.poll_changes)
+
+    def on_close(self):
+        self.after_cancel(self.poll_job)
+        try:
+            self.todo.close()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save tasks: {e}")
+        self.destroy()
+
+    def report_save_error(self, error):
+        messagebox.showerror("Error", f"Could not save tasks: {error}")
 
     def create_widgets(self):
         input_frame = ttk.Frame(self, padding="10")
@@ -102,20 +133,38 @@ class TodoApp(tk.Tk):
         )
         show_completed_cb.pack(side=tk.LEFT)
 
-        self.canvas = tk.Canvas(self, bg="#f0f0f0")
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.canvas)
-
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self.sort_by_due_var = tk.BooleanVar()
+        sort_by_due_cb = ttk.Checkbutton(
+            filter_frame,
+            text="Sort by Due Date",
+            variable=self.sort_by_due_var,
+            command=self.refresh_tasks
         )
+        sort_by_due_cb.pack(side=tk.LEFT, padx=10)
 
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas = tk.Canvas(self, bg="#f0f0f0", yscrollincrement=ROW_HEIGHT)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self.on_mousewheel)
 
         self.canvas.pack(side="left", fill="both", expand=True, padx=10, pady=5)
-        scrollbar.pack(side="right", fill="y", pady=5)
+        self.scrollbar.pack(side="right", fill="y", pady=5)
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.render_visible()
+
+    def on_canvas_resize(self, event):
+        for row in self.rows:
+            self.canvas.itemconfigure(row.item, width=event.width)
+        self.render_visible()
+
+    def on_mousewheel(self, event):
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self.canvas.yview_scroll(step, "units")
 
     def add_task(self):
         title = self.title_entry.get().strip()
@@ -134,75 +183,92 @@ class TodoApp(tk.Tk):
         
         self.refresh_tasks()
 
-    def create_task_frame(self, task):
-        task_frame = ttk.Frame(self.scrollable_frame, style="Task.TFrame")
-        task_frame.pack(fill=tk.X, padx=5, pady=2)
-
-       
-        completed_var = tk.BooleanVar(value=task["completed"])
-        completed_cb = ttk.Checkbutton(
-            task_frame,
-            variable=completed_var,
-            command=lambda: self.toggle_task_completion(task["id"])
-        )
-        completed_cb.pack(side=tk.LEFT, padx=5)
-
-     
-        info_frame = ttk.Frame(task_frame)
-        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-
-        title_label = ttk.Label(
-            info_frame,
-            text=task["title"],
-            style="TaskTitle.TLabel"
-        )
-        title_label.pack(anchor="w")
-
-        if task["description"]:
-            desc_label = ttk.Label(
-                info_frame,
-                text=task["description"],
-                style="TaskInfo.TLabel"
-            )
-            desc_label.pack(anchor="w")
-
-        if task["due_date"]:
-            date_label = ttk.Label(
-                info_frame,
-                text=f"Due: {task['due_date']}",
-                style="TaskInfo.TLabel"
-            )
-            date_label.pack(anchor="w")
-
-        
-        delete_button = ttk.Button(
-            task_frame,
-            text="Delete",
-            command=lambda: self.delete_task(task["id"])
-        )
-        delete_button.pack(side=tk.RIGHT, padx=5)
-
     def toggle_task_completion(self, task_id):
         self.todo.complete_task(task_id)
-        self.refresh_tasks()
+        if self.show_completed_var.get():
+            self.update_task_row(task_id)
+        else:
+            self.refresh_tasks()
 
     def delete_task(self, task_id):
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this task?"):
             self.todo.delete_task(task_id)
             self.refresh_tasks()
 
-    def refresh_tasks(self):
-       
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def update_task_row(self, task_id):
+        task = self.todo.get_task(task_id)
+        for row in self.rows:
+            if row.task_id == task_id and task is not None:
+                row.bind(task)
+
+    def task_filter(self):
+        return {"completed": None if self.show_completed_var.get() else False}
+
+    def task_order(self):
+        return {"order_by": "due_ts" if self.sort_by_due_var.get() else "id"}
+
+    def render_visible(self):
+        top = int(self.canvas.canvasy(0))
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(self.canvas.cget("height"))
+        first = top // ROW_HEIGHT
+        last = min(self.total, (top + height) // ROW_HEIGHT + 1)
+        page = self.todo.query(**self.task_filter(), **self.task_order(), limit=max(last - first, 0), offset=first)
+
+        while len(self.rows) < len(page):
+            row = TaskRow(self, self.canvas)
+            self.canvas.itemconfigure(row.item, width=self.canvas.winfo_width())
+            self.rows.append(row)
+
+        for offset, row in enumerate(self.rows):
+            if offset < len(page):
+                task = page[offset]
+                if row.task_id != task["id"]:
+                    row.bind(task)
+                self.canvas.coords(row.item, 0, (first + offset) * ROW_HEIGHT)
+                self.canvas.itemconfigure(row.item, state="normal")
+            else:
+                row.task_id = None
+                self.canvas.itemconfigure(row.item, state="hidden")
+
+    def poll_changes(self):
+        error = None
+        while True:
+            try:
+                error = self.save_errors.get_nowait()
+            except queue.Empty:
+                break
+        if error is not None:
+            self.report_save_error(error)
+        try:
+            changed = self.todo.poll_changes()
+        except (OSError, ValueError):
+            changed = set()
+        if changed is None:
+            self.refresh_tasks()
+        elif changed:
+            self.total = self.todo.count(**self.task_filter())
+            self.canvas.configure(scrollregion=(0, 0, 0, self.total * ROW_HEIGHT))
+            for row in self.rows:
+                if row.task_id in changed:
+                    row.task_id = None
+            self.render_visible()
+        self.poll_job = self.after(self.poll_interval, self.poll_changes)
 
-       
-        for task in self.todo.tasks:
-            if self.show_completed_var.get() or not task["completed"]:
-                self.create_task_frame(task)
+    def refresh_tasks(self):
+        self.total = self.todo.count(**self.task_filter())
+        for row in self.rows:
+            row.task_id = None
+        self.canvas.configure(scrollregion=(0, 0, 0, self.total * ROW_HEIGHT))
+        self.render_visible()
 
 def main():
-    app = TodoApp()
+    todo = None
+    if "--sqlite" in sys.argv[1:]:
+        from todo_sqlite import SqliteTodoList
+        todo = SqliteTodoList()
+    app = TodoApp(todo)
     app.mainloop()
 
 if __name__ == "__main__":
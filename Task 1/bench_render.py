@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+from Task1 import TodoApp, TodoList
+from todo_storage import JournalStorage
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench(app: TodoApp, size: int) -> None:
+    app.todo.add_many((f"Task {i}", f"Description {i}", "") for i in range(size - len(app.todo.tasks)))
+
+    def refresh():
+        app.refresh_tasks()
+        app.update_idletasks()
+
+    def scroll():
+        app.canvas.yview_moveto(0.5)
+        app.update_idletasks()
+
+    def toggle():
+        app.toggle_task_completion(app.rows[0].task_id)
+        app.update_idletasks()
+
+    print(f"{size:>8} tasks  refresh {timed(refresh):8.2f} ms  "
+          f"scroll {timed(scroll):6.2f} ms  toggle {timed(toggle):6.2f} ms  "
+          f"rows {len(app.rows)}")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JournalStorage(os.path.join(tmp, "tasks.json"), compact_every=max(sizes) + 1)
+        try:
+            app = TodoApp(TodoList(storage))
+        except tk.TclError as e:
+            print(f"Cannot open a Tk display ({e}); run under xvfb-run.")
+            return
+        app.withdraw()
+        app.update()
+        for size in sorted(sizes):
+            bench(app, size)
+        app.destroy()
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
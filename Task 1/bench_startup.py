@@ -0,0 +1,55 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BUDGET = 0.15
+RUNS = 15
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def timed(args, cwd):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks = os.path.join(tmp, "tasks.json")
+        cli = os.path.join(HERE, "todo_cli.py")
+        subprocess.run([sys.executable, cli, "--file", tasks, "batch", "-"], check=True,
+                       input="".join(f"add 'Task {i}' --due 2030-01-{i % 28 + 1:02d}\n" for i in range(1000)),
+                       text=True, stdout=subprocess.DEVNULL)
+
+        leaked = subprocess.run(
+            [sys.executable, "-c", "import sys, todo_cli; print(sorted(m for m in sys.modules if m.startswith('tkinter')))"],
+            cwd=HERE, check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+        results = [
+            ("python -c pass", timed(["-c", "pass"], HERE)),
+            ("todo_cli.py ls (1000 tasks)", timed([cli, "--file", tasks, "ls"], HERE)),
+            ("todo_cli.py add", timed([cli, "--file", tasks, "add", "x"], HERE)),
+        ]
+        try:
+            results.append(("import Task1 (GUI)", timed(["-c", "import Task1"], HERE)))
+        except subprocess.CalledProcessError:
+            pass
+
+    for label, seconds in results:
+        print(f"{label:<30} {seconds * 1000:8.1f} ms")
+    print(f"tkinter modules loaded by todo_cli: {leaked}")
+    cli_time = max(seconds for label, seconds in results if label.startswith("todo_cli"))
+    ok = cli_time <= BUDGET and leaked == "[]"
+    print(f"budget {BUDGET * 1000:.0f} ms: {'OK' if ok else 'EXCEEDED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
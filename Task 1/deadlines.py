@@ -0,0 +1,74 @@
+import bisect
+import datetime
+import time
+from typing import List, Optional, Tuple, Union
+
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M",
+    "%d-%m-%Y",
+    "%d-%m-%y",
+    "%d/%m/%Y",
+    "%d/%m/%y",
+    "%d.%m.%Y",
+    "%Y/%m/%d",
+]
+
+DateLike = Union[str, float, int, datetime.date, None]
+
+
+def parse_due_date(text: str) -> Optional[float]:
+    text = text.strip()
+    if not text:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def to_timestamp(value: DateLike) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time()).timestamp()
+    ts = parse_due_date(value)
+    if ts is None:
+        raise ValueError(f"Unrecognised date: {value!r}")
+    return ts
+
+
+class DeadlineIndex:
+    def __init__(self, entries: Optional[List[Tuple[float, int]]] = None):
+        self.entries: List[Tuple[float, int]] = sorted(entries or [])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, task_id: int, due_ts: float) -> None:
+        bisect.insort(self.entries, (due_ts, task_id))
+
+    def remove(self, task_id: int, due_ts: float) -> None:
+        i = bisect.bisect_left(self.entries, (due_ts, task_id))
+        if i < len(self.entries) and self.entries[i] == (due_ts, task_id):
+            del self.entries[i]
+
+    def ids(self) -> List[int]:
+        return [task_id for _, task_id in self.entries]
+
+    def next_due(self, n: int, now: Optional[float] = None) -> List[int]:
+        i = bisect.bisect_left(self.entries, (time.time() if now is None else now,))
+        return [task_id for _, task_id in self.entries[i:i + n]]
+
+    def overdue(self, now: Optional[float] = None) -> List[int]:
+        i = bisect.bisect_left(self.entries, (time.time() if now is None else now,))
+        return [task_id for _, task_id in self.entries[:i]]
+
+    def due_between(self, start: float, end: float) -> List[int]:
+        lo = bisect.bisect_left(self.entries, (start,))
+        hi = bisect.bisect_right(self.entries, (end, float("inf")))
+        return [task_id for _, task_id in self.entries[lo:hi]]
@@ -0,0 +1,139 @@
+import argparse
+import sys
+from typing import List, Optional, TextIO
+
+from deadlines import parse_due_date, to_timestamp
+
+COMMANDS = ("add", "done", "rm", "ls")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="todo_cli.py", description="Manage the to-do list without the GUI")
+    parser.add_argument("--file", default="tasks.json", help="task file (default: tasks.json)")
+    parser.add_argument("--sqlite", metavar="DB", help="use a SQLite database instead of the task file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("title")
+    add.add_argument("-d", "--description", default="")
+    add.add_argument("--due", default="", help="due date, e.g. 2024-05-31 or 31/05/2024")
+
+    done = commands.add_parser("done", help="mark tasks as completed")
+    done.add_argument("ids", nargs="+", type=int)
+
+    rm = commands.add_parser("rm", help="delete tasks")
+    rm.add_argument("ids", nargs="+", type=int)
+
+    ls = commands.add_parser("ls", help="list tasks")
+    ls.add_argument("--pending", action="store_true", help="only tasks that are not completed")
+    ls.add_argument("--due-before", metavar="DATE", help="only tasks due on or before DATE")
+    ls.add_argument("--limit", type=int)
+
+    batch = commands.add_parser("batch", help="run one command per line from a file or stdin")
+    batch.add_argument("source", nargs="?", default="-", help="command file, or - for stdin")
+    return parser
+
+
+def open_todo(args: argparse.Namespace):
+    if args.sqlite:
+        from todo_sqlite import SqliteTodoList
+        return SqliteTodoList(args.sqlite, json_filename=None)
+    from todo_list import TodoList
+    from todo_storage import JournalStorage
+    return TodoList(JournalStorage(args.file, compact_on_close=False))
+
+
+def format_task(task) -> str:
+    line = f"{task['id']:>5} [{'x' if task['completed'] else ' '}] {task['title']}"
+    if task["due_date"]:
+        line += f"  (due {task['due_date']})"
+    if task["description"]:
+        line += f"  - {task['description']}"
+    return line
+
+
+def run(todo, args: argparse.Namespace, out: TextIO) -> int:
+    if args.command == "add":
+        if args.due and parse_due_date(args.due) is None:
+            print(f"warning: could not parse due date {args.due!r}", file=sys.stderr)
+        task = todo.add_task(args.title, args.description, args.due)
+        print(f"added {task['id']}", file=out)
+    elif args.command in ("done", "rm"):
+        found = {task_id: todo.get_task(task_id) for task_id in args.ids}
+        missing = [task_id for task_id, task in found.items() if task is None]
+        for task_id in missing:
+            print(f"no task with id {task_id}", file=sys.stderr)
+        if args.command == "done":
+            todo.complete_many([task_id for task_id, task in found.items() if task and not task["completed"]])
+        else:
+            todo.delete_many([task_id for task_id, task in found.items() if task])
+        return 1 if missing else 0
+    elif args.command == "ls":
+        due_to = to_timestamp(args.due_before) if args.due_before else None
+        tasks = todo.query(
+            completed=False if args.pending else None,
+            due_to=due_to,
+            order_by="due_ts" if due_to is not None else "id",
+            limit=args.limit,
+        )
+        for task in tasks:
+            print(format_task(task), file=out)
+    return 0
+
+
+def run_batch(todo, parser: argparse.ArgumentParser, lines, out: TextIO) -> int:
+    import shlex
+
+    status = 0
+    with todo.batch():
+        for lineno, line in enumerate(lines, 1):
+            try:
+                words = shlex.split(line, comments=True)
+            except ValueError as e:
+                print(f"line {lineno}: {e}", file=sys.stderr)
+                status = 1
+                continue
+            if not words:
+                continue
+            if words[0] not in COMMANDS:
+                print(f"line {lineno}: unknown command {words[0]!r}", file=sys.stderr)
+                status = 1
+                continue
+            try:
+                args = parser.parse_args(words)
+            except SystemExit:
+                print(f"line {lineno}: could not parse {line.strip()!r}", file=sys.stderr)
+                status = 1
+                continue
+            try:
+                status = run(todo, args, out) or status
+            except ValueError as e:
+                print(f"line {lineno}: {e}", file=sys.stderr)
+                status = 1
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        todo = open_todo(args)
+    except ValueError as e:
+        print(f"error: could not load tasks: {e}", file=sys.stderr)
+        return 1
+    try:
+        if args.command == "batch":
+            if args.source == "-":
+                return run_batch(todo, parser, sys.stdin, sys.stdout)
+            with open(args.source, 'r') as f:
+                return run_batch(todo, parser, f, sys.stdout)
+        return run(todo, args, sys.stdout)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        todo.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
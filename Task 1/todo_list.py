@@ -0,0 +1,288 @@
+import datetime
+import json
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+from deadlines import DateLike, DeadlineIndex, parse_due_date, to_timestamp
+
+if TYPE_CHECKING:
+    from todo_storage import JsonStorage
+
+
+class TodoList:
+    def __init__(self, storage: Optional["JsonStorage"] = None):
+        self._tasks: Dict[int, Dict] = {}
+        self.deadlines = DeadlineIndex()
+        self.next_id = 1
+        self._version = 0
+        self._lock = threading.RLock()
+        self._query_cache: Dict[tuple, List[int]] = {}
+        self._query_cache_version = -1
+        self._batch: Optional[List[Dict]] = None
+        self._changed: Set[int] = set()
+        if storage is None:
+            from todo_storage import JournalStorage
+            storage = JournalStorage("tasks.json")
+        self.storage = storage
+        self.filename = self.storage.filename
+        self.load_tasks()
+
+    @property
+    def tasks(self):
+        return self._tasks.values()
+
+    def get_task(self, task_id: int) -> Optional[Dict]:
+        return self._tasks.get(task_id)
+
+    def load_tasks(self) -> None:
+        with self.storage.lock():
+            self._tasks, self.next_id = self.storage.load()
+        self._reindex()
+
+    def save_tasks(self) -> None:
+        with self._exclusive():
+            self.storage.save(self._tasks, self.next_id)
+
+    def poll_changes(self) -> Set[int]:
+        with self.storage.lock():
+            self._catch_up()
+        changed, self._changed = self._changed, set()
+        return changed
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        # Hold the storage lock and apply other processes' changes first, so new ids
+        # are allocated from the latest state and our records land after theirs.
+        with self.storage.lock():
+            self._catch_up()
+            yield
+
+    def _catch_up(self) -> None:
+        records = self.storage.changes()
+        if records is None:
+            tasks, next_id = self.storage.load()
+            for task in tasks.values():
+                if "due_ts" not in task:
+                    task["due_ts"] = parse_due_date(task["due_date"])
+            changed = {
+                task_id for task_id in self._tasks.keys() | tasks.keys()
+                if self._tasks.get(task_id) != tasks.get(task_id)
+            }
+            for task_id in sorted(changed):
+                self._replace(task_id, tasks.get(task_id))
+            self.next_id = max(self.next_id, next_id)
+        else:
+            changed = set()
+            for record in records:
+                if record["op"] == "add":
+                    task = dict(record["task"])
+                    self._replace(task["id"], task)
+                    self.next_id = max(self.next_id, task["id"] + 1)
+                    changed.add(task["id"])
+                elif record["op"] == "toggle":
+                    task = self._tasks.get(record["id"])
+                    if task is not None:
+                        self._replace(record["id"], dict(task, completed=record["completed"]))
+                        changed.add(record["id"])
+                elif record["op"] == "delete":
+                    if self._replace(record["id"], None) is not None:
+                        changed.add(record["id"])
+        if changed:
+            self._version += 1
+            self._changed |= changed
+
+    def _replace(self, task_id: int, task: Optional[Dict]) -> Optional[Dict]:
+        with self._lock:
+            # Assigning to an existing key keeps its place in id order.
+            old = self._tasks.get(task_id) if task is not None else self._tasks.pop(task_id, None)
+            if old is not None and old["due_ts"] is not None and not old["completed"]:
+                self.deadlines.remove(task_id, old["due_ts"])
+            if task is not None:
+                if "due_ts" not in task:
+                    task["due_ts"] = parse_due_date(task["due_date"])
+                self._tasks[task_id] = task
+                if task["due_ts"] is not None and not task["completed"]:
+                    self.deadlines.add(task_id, task["due_ts"])
+            return old
+
+    def close(self) -> None:
+        self.storage.close()
+
+    @contextmanager
+    def batch(self) -> Iterator["TodoList"]:
+        if self._batch is not None:
+            yield self
+            return
+        with self._exclusive():
+            self._batch = []
+            try:
+                yield self
+            except BaseException:
+                # Nothing was written yet, so roll back like the SQLite backend does.
+                self._batch = None
+                self._tasks, self.next_id = self.storage.load()
+                self._reindex()
+                raise
+            records, self._batch = self._batch, None
+            if records:
+                self.storage.append(records, self._snapshot)
+
+    def import_json(self, filename: str) -> None:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        tasks = data["tasks"] if isinstance(data, dict) else data
+        with self._exclusive():
+            self._tasks = {task["id"]: task for task in tasks}
+            self.next_id = max(self.next_id, max(self._tasks, default=0) + 1)
+            self._reindex()
+            self.save_tasks()
+
+    def export_json(self, filename: str) -> None:
+        with open(filename, 'w') as f:
+            json.dump(list(self._tasks.values()), f, indent=2)
+
+    def _reindex(self) -> None:
+        for task in self._tasks.values():
+            if "due_ts" not in task:
+                task["due_ts"] = parse_due_date(task["due_date"])
+        self.deadlines = DeadlineIndex([
+            (task["due_ts"], task["id"]) for task in self._tasks.values()
+            if task["due_ts"] is not None and not task["completed"]
+        ])
+        self._version += 1
+
+    def _snapshot(self):
+        with self._lock:
+            return {task_id: dict(task) for task_id, task in self._tasks.items()}, self.next_id
+
+    def _record(self, records: List[Dict]) -> None:
+        self._version += 1
+        if not records:
+            return
+        if self._batch is not None:
+            self._batch.extend(records)
+        else:
+            self.storage.append(records, self._snapshot)
+
+    def _select(self, completed: Optional[bool], due_from: DateLike, due_to: DateLike,
+                text: Optional[str], order_by: str, descending: bool) -> List[int]:
+        if self._query_cache_version != self._version:
+            self._query_cache = {}
+            self._query_cache_version = self._version
+        key = (completed, due_from, due_to, text, order_by, descending)
+        ids = self._query_cache.get(key)
+        if ids is not None:
+            return ids
+        due_from, due_to = to_timestamp(due_from), to_timestamp(due_to)
+        if (order_by == "due_ts" and completed is False and not descending
+                and due_from is None and due_to is None and not text):
+            ids = self.deadlines.ids() + [
+                task["id"] for task in self._tasks.values()
+                if task["due_ts"] is None and not task["completed"]
+            ]
+        else:
+            text = text.lower() if text else None
+            tasks = [
+                task for task in self._tasks.values()
+                if (completed is None or task["completed"] == completed)
+                and (due_from is None or (task["due_ts"] is not None and task["due_ts"] >= due_from))
+                and (due_to is None or (task["due_ts"] is not None and task["due_ts"] <= due_to))
+                and (text is None or text in task["title"].lower())
+            ]
+            if order_by == "due_ts":
+                sign = -1 if descending else 1
+                tasks.sort(key=lambda task: (task["due_ts"] is None, sign * (task["due_ts"] or 0.0), sign * task["id"]))
+            elif order_by != "id" or descending:
+                tasks.sort(key=lambda task: task[order_by], reverse=descending)
+            ids = [task["id"] for task in tasks]
+        self._query_cache[key] = ids
+        return ids
+
+    def query(self, completed: Optional[bool] = None, due_from: DateLike = None,
+              due_to: DateLike = None, text: Optional[str] = None, order_by: str = "id",
+              descending: bool = False, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        ids = self._select(completed, due_from, due_to, text, order_by, descending)
+        end = None if limit is None else offset + limit
+        return [self._tasks[task_id] for task_id in ids[offset:end]]
+
+    def count(self, completed: Optional[bool] = None, due_from: DateLike = None,
+              due_to: DateLike = None, text: Optional[str] = None) -> int:
+        return len(self._select(completed, due_from, due_to, text, "id", False))
+
+    def next_due(self, n: int, now: Optional[float] = None) -> List[Dict]:
+        return [self._tasks[task_id] for task_id in self.deadlines.next_due(n, now)]
+
+    def overdue(self, now: Optional[float] = None) -> List[Dict]:
+        return [self._tasks[task_id] for task_id in self.deadlines.overdue(now)]
+
+    def due_between(self, start: DateLike, end: DateLike) -> List[Dict]:
+        ids = self.deadlines.due_between(to_timestamp(start), to_timestamp(end))
+        return [self._tasks[task_id] for task_id in ids]
+
+    def _new_task(self, title: str, description: str = "", due_date: str = "") -> Dict:
+        task = {
+            "title": title,
+            "description": description,
+            "due_date": due_date,
+            "due_ts": parse_due_date(due_date),
+            "completed": False,
+            "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        with self._lock:
+            task = {"id": self.next_id, **task}
+            self.next_id += 1
+            self._tasks[task["id"]] = task
+            if task["due_ts"] is not None:
+                self.deadlines.add(task["id"], task["due_ts"])
+        return task
+
+    def _toggle(self, task_id: int) -> Optional[Dict]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            task["completed"] = not task["completed"]
+            if task["due_ts"] is not None:
+                if task["completed"]:
+                    self.deadlines.remove(task_id, task["due_ts"])
+                else:
+                    self.deadlines.add(task_id, task["due_ts"])
+            return {"op": "toggle", "id": task_id, "completed": task["completed"]}
+
+    def _delete(self, task_id: int) -> Optional[Dict]:
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                return None
+            if task["due_ts"] is not None:
+                self.deadlines.remove(task_id, task["due_ts"])
+            return {"op": "delete", "id": task_id}
+
+    def add_task(self, title: str, description: str = "", due_date: str = "") -> Dict:
+        with self._exclusive():
+            task = self._new_task(title, description, due_date)
+            self._record([{"op": "add", "task": dict(task)}])
+        return task
+
+    def complete_task(self, task_id: int) -> None:
+        with self._exclusive():
+            self._record([r for r in [self._toggle(task_id)] if r])
+
+    def delete_task(self, task_id: int) -> None:
+        with self._exclusive():
+            self._record([r for r in [self._delete(task_id)] if r])
+
+    def add_many(self, items: Iterable[Sequence[str]]) -> List[Dict]:
+        with self._exclusive():
+            tasks = [self._new_task(*item) for item in items]
+            self._record([{"op": "add", "task": dict(task)} for task in tasks])
+        return tasks
+
+    def complete_many(self, task_ids: Iterable[int]) -> None:
+        with self._exclusive():
+            self._record([r for r in map(self._toggle, task_ids) if r])
+
+    def delete_many(self, task_ids: Iterable[int]) -> None:
+        with self._exclusive():
+            self._record([r for r in map(self._delete, task_ids) if r])
@@ -0,0 +1,239 @@
+import datetime
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+from deadlines import DateLike, parse_due_date, to_timestamp
+from todo_storage import JournalStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    due_date TEXT NOT NULL DEFAULT '',
+    due_ts REAL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_tasks_due_ts ON tasks (due_ts);
+CREATE INDEX IF NOT EXISTS idx_tasks_pending_due_ts ON tasks (completed, due_ts);
+"""
+
+COLUMNS = "id, title, description, due_date, due_ts, completed, created_at"
+ORDER_COLUMNS = {"id", "title", "due_date", "due_ts", "created_at"}
+
+
+def _row_to_task(row: sqlite3.Row) -> Dict:
+    task = dict(row)
+    task["completed"] = bool(task["completed"])
+    return task
+
+
+class SqliteTodoList:
+    def __init__(self, filename: str = "tasks.db", json_filename: Optional[str] = "tasks.json"):
+        self.filename = filename
+        self.json_filename = json_filename
+        self.conn: Optional[sqlite3.Connection] = None
+        self._in_batch = False
+        self._data_version = None
+        self.load_tasks()
+
+    @property
+    def tasks(self) -> List[Dict]:
+        return self.query()
+
+    def get_task(self, task_id: int) -> Optional[Dict]:
+        row = self.conn.execute(f"SELECT {COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return _row_to_task(row) if row else None
+
+    def load_tasks(self) -> None:
+        if self.conn is not None:
+            return
+        self.conn = sqlite3.connect(self.filename)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self._add_due_ts_column()
+            self.conn.executescript(INDEXES)
+        empty = self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'tasks')").fetchone()[0]
+        if empty and self.json_filename and os.path.exists(self.json_filename):
+            self.migrate_json(self.json_filename)
+
+    def _add_due_ts_column(self) -> None:
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        if "due_ts" in columns:
+            return
+        self.conn.execute("ALTER TABLE tasks ADD COLUMN due_ts REAL")
+        self.conn.executemany(
+            "UPDATE tasks SET due_ts = ? WHERE id = ?",
+            [(parse_due_date(row["due_date"]), row["id"])
+             for row in self.conn.execute("SELECT id, due_date FROM tasks WHERE due_date != ''")]
+        )
+
+    def save_tasks(self) -> None:
+        self.conn.commit()
+
+    def poll_changes(self) -> Optional[Set[int]]:
+        # SQLite only tells us that another connection committed, not what changed,
+        # so None means "reload whatever is on screen".
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        changed = self._data_version is not None and version != self._data_version
+        self._data_version = version
+        return None if changed else set()
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    @contextmanager
+    def batch(self) -> Iterator["SqliteTodoList"]:
+        if self._in_batch:
+            yield self
+            return
+        self._in_batch = True
+        try:
+            with self.conn:
+                yield self
+        finally:
+            self._in_batch = False
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        if self._in_batch:
+            yield
+        else:
+            with self.conn:
+                yield
+
+    def migrate_json(self, filename: str) -> None:
+        tasks, next_id = JournalStorage(filename).load()
+        self._insert(tasks.values(), next_id)
+
+    def import_json(self, filename: str) -> None:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        self._insert(data["tasks"] if isinstance(data, dict) else data)
+
+    def export_json(self, filename: str) -> None:
+        with open(filename, 'w') as f:
+            json.dump(self.query(), f, indent=2)
+
+    def _insert(self, tasks: Iterable[Dict], next_id: int = 0) -> None:
+        with self._transaction():
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO tasks ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((t["id"], t["title"], t["description"], t["due_date"],
+                  t["due_ts"] if "due_ts" in t else parse_due_date(t["due_date"]),
+                  int(t["completed"]), t["created_at"])
+                 for t in tasks)
+            )
+            updated = self.conn.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tasks'", (next_id - 1,)
+            ).rowcount
+            if not updated:
+                self.conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', ?)", (next_id - 1,))
+
+    def _where(self, completed: Optional[bool], due_from: DateLike, due_to: DateLike,
+               text: Optional[str]):
+        clauses, params = [], []
+        if completed is not None:
+            clauses.append("completed = ?")
+            params.append(int(completed))
+        if due_from is not None:
+            clauses.append("due_ts >= ?")
+            params.append(to_timestamp(due_from))
+        if due_to is not None:
+            clauses.append("due_ts <= ?")
+            params.append(to_timestamp(due_to))
+        if text:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, completed: Optional[bool] = None, due_from: DateLike = None,
+              due_to: DateLike = None, text: Optional[str] = None, order_by: str = "id",
+              descending: bool = False, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot sort by {order_by!r}")
+        where, params = self._where(completed, due_from, due_to, text)
+        direction = "DESC" if descending else "ASC"
+        nulls = f"{order_by} IS NULL, " if order_by == "due_ts" else ""
+        sql = f"SELECT {COLUMNS} FROM tasks{where} ORDER BY {nulls}{order_by} {direction}, id {direction}"
+        sql += " LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        return [_row_to_task(row) for row in self.conn.execute(sql, params)]
+
+    def count(self, completed: Optional[bool] = None, due_from: DateLike = None,
+              due_to: DateLike = None, text: Optional[str] = None) -> int:
+        where, params = self._where(completed, due_from, due_to, text)
+        return self.conn.execute(f"SELECT COUNT(*) FROM tasks{where}", params).fetchone()[0]
+
+    def next_due(self, n: int, now: Optional[float] = None) -> List[Dict]:
+        return self._pending_due("due_ts >= ?", [time.time() if now is None else now], n)
+
+    def overdue(self, now: Optional[float] = None) -> List[Dict]:
+        return self._pending_due("due_ts < ?", [time.time() if now is None else now])
+
+    def due_between(self, start: DateLike, end: DateLike) -> List[Dict]:
+        return self._pending_due("due_ts BETWEEN ? AND ?", [to_timestamp(start), to_timestamp(end)])
+
+    def _pending_due(self, clause: str, params: List, limit: int = -1) -> List[Dict]:
+        sql = (f"SELECT {COLUMNS} FROM tasks WHERE completed = 0 AND {clause} "
+               "ORDER BY due_ts, id LIMIT ?")
+        return [_row_to_task(row) for row in self.conn.execute(sql, params + [limit])]
+
+    def add_task(self, title: str, description: str = "", due_date: str = "") -> Dict:
+        return self.add_many([(title, description, due_date)])[0]
+
+    def add_many(self, items: Iterable[Sequence[str]]) -> List[Dict]:
+        created_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        tasks = []
+        with self._transaction():
+            for item in items:
+                title, description, due_date = (list(item) + ["", ""])[:3]
+                due_ts = parse_due_date(due_date)
+                cursor = self.conn.execute(
+                    "INSERT INTO tasks (title, description, due_date, due_ts, completed, created_at) "
+                    "VALUES (?, ?, ?, ?, 0, ?)",
+                    (title, description, due_date, due_ts, created_at)
+                )
+                tasks.append({
+                    "id": cursor.lastrowid,
+                    "title": title,
+                    "description": description,
+                    "due_date": due_date,
+                    "due_ts": due_ts,
+                    "completed": False,
+                    "created_at": created_at
+                })
+        return tasks
+
+    def complete_task(self, task_id: int) -> None:
+        self.complete_many([task_id])
+
+    def delete_task(self, task_id: int) -> None:
+        self.delete_many([task_id])
+
+    def complete_many(self, task_ids: Iterable[int]) -> None:
+        with self._transaction():
+            self.conn.executemany(
+                "UPDATE tasks SET completed = NOT completed WHERE id = ?",
+                ((task_id,) for task_id in task_ids)
+            )
+
+    def delete_many(self, task_ids: Iterable[int]) -> None:
+        with self._transaction():
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", ((task_id,) for task_id in task_ids))
@@ -0,0 +1,411 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+State = Tuple[Dict[int, Dict], int]
+Stamp = Optional[Tuple[int, int, int]]
+
+
+def _write_atomic(filename: str, data) -> None:
+    tmp = filename + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filename)
+
+
+def _to_state(data) -> State:
+    if isinstance(data, list):
+        data = {"tasks": data}
+    tasks = {task["id"]: task for task in data.get("tasks", [])}
+    next_id = max(data.get("next_id", 1), max(tasks, default=0) + 1)
+    return tasks, next_id
+
+
+def apply_record(tasks: Dict[int, Dict], record: Dict) -> None:
+    op = record["op"]
+    if op == "add":
+        task = record["task"]
+        tasks[task["id"]] = task
+    elif op == "toggle":
+        if record["id"] in tasks:
+            tasks[record["id"]]["completed"] = record["completed"]
+    elif op == "delete":
+        tasks.pop(record["id"], None)
+
+
+def _stamp(filename: str) -> Stamp:
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class FileLock:
+    # Exclusive lock on a sidecar file: excludes other processes, re-entrant within this one.
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._mutex = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self) -> "FileLock":
+        self._mutex.acquire()
+        if self._depth == 0:
+            try:
+                self._acquire()
+            except BaseException:
+                self._mutex.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                self._release()
+        finally:
+            self._mutex.release()
+
+    def _acquire(self) -> None:
+        if self._file is None:
+            self._file = open(self.filename, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            return
+        while True:
+            self._file.seek(0)
+            try:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _release(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self) -> None:
+        with self._mutex:
+            if self._file is not None and self._depth == 0:
+                self._file.close()
+                self._file = None
+
+
+class JsonStorage:
+    # Whether append() writes just the records (True) or rewrites the whole file.
+    incremental = False
+
+    def __init__(self, filename: str = "tasks.json"):
+        self.filename = filename
+        self.session = os.urandom(8).hex()
+        self._file_lock = FileLock(filename + ".lock")
+        self._stamp: Stamp = None
+
+    def lock(self) -> FileLock:
+        return self._file_lock
+
+    def load(self) -> State:
+        with self._file_lock:
+            self._stamp = _stamp(self.filename)
+            try:
+                with open(self.filename, 'r') as f:
+                    return _to_state(json.load(f))
+            except FileNotFoundError:
+                return {}, 1
+
+    def save(self, tasks: Dict[int, Dict], next_id: int) -> None:
+        with self._file_lock:
+            _write_atomic(self.filename, {"next_id": next_id, "tasks": list(tasks.values())})
+            self._stamp = _stamp(self.filename)
+
+    def append(self, records: List[Dict], snapshot: Callable[[], State]) -> None:
+        with self._file_lock:
+            self.save(*snapshot())
+
+    def changes(self) -> Optional[List[Dict]]:
+        # Records other processes wrote since our last load or save; None means reload everything.
+        return [] if _stamp(self.filename) == self._stamp else None
+
+    def sync(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._file_lock.close()
+
+
+class JournalStorage(JsonStorage):
+    incremental = True
+
+    def __init__(self, filename: str = "tasks.json", compact_every: int = 1000,
+                 compact_on_close: bool = True):
+        super().__init__(filename)
+        self.journal = filename + ".journal"
+        self.compact_every = compact_every
+        self.compact_on_close = compact_on_close
+        self.pending = 0
+        self._offset = 0
+        self._log = None
+
+    def load(self) -> State:
+        with self._file_lock:
+            tasks, next_id = super().load()
+            self.pending = 0
+            self._offset = 0
+            for record in self._read_journal():
+                apply_record(tasks, record)
+                if record["op"] == "add":
+                    next_id = max(next_id, record["task"]["id"] + 1)
+            return tasks, next_id
+
+    def _read_journal(self) -> Iterator[Dict]:
+        try:
+            f = open(self.journal, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._offset)
+            for line in f:
+                # A line without a newline is a write torn by a crash (appends hold
+                # the lock); the next append terminates it, after which it is skipped.
+                if not line.endswith(b"\n"):
+                    break
+                self._offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self.pending += 1
+                yield record
+
+    def append(self, records: List[Dict], snapshot: Callable[[], State]) -> None:
+        data = "".join(json.dumps(dict(r, session=self.session)) + "\n" for r in records).encode('utf-8')
+        with self._file_lock:
+            if self._log is None:
+                self._log = open(self.journal, 'ab')
+            size = os.fstat(self._log.fileno()).st_size
+            caught_up = size == self._offset
+            if not caught_up and size and not self._ends_with_newline(size):
+                data = b"\n" + data
+            self._log.write(data)
+            self._log.flush()
+            if caught_up:
+                self._offset += len(data)
+                self.pending += len(records)
+            if self.pending >= self.compact_every:
+                self.compact()
+
+    def _ends_with_newline(self, size: int) -> bool:
+        with open(self.journal, 'rb') as f:
+            f.seek(size - 1)
+            return f.read(1) == b"\n"
+
+    def changes(self) -> Optional[List[Dict]]:
+        with self._file_lock:
+            if _stamp(self.filename) != self._stamp:
+                return None
+            try:
+                if os.path.getsize(self.journal) < self._offset:
+                    return None
+            except FileNotFoundError:
+                return [] if self._offset == 0 else None
+            return [record for record in self._read_journal() if record.get("session") != self.session]
+
+    def save(self, tasks: Dict[int, Dict], next_id: int) -> None:
+        with self._file_lock:
+            super().save(tasks, next_id)
+            self._truncate_journal()
+
+    def compact(self) -> None:
+        with self._file_lock:
+            tasks, next_id = self.load()
+            super().save(tasks, next_id)
+            self._truncate_journal()
+
+    def sync(self) -> None:
+        if self._log is not None:
+            os.fsync(self._log.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        if self.pending and self.compact_on_close:
+            self.compact()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        super().close()
+
+    def _truncate_journal(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        with open(self.journal, 'w') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending = 0
+        self._offset = 0
+
+
+class BackgroundWriter:
+    def __init__(self, storage: JsonStorage, debounce: float = 0.25,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.storage = storage
+        self.filename = storage.filename
+        self.debounce = debounce
+        self.on_error = on_error
+        self._cond = threading.Condition()
+        self._pending: List[Dict] = []
+        self._inflight: List[Dict] = []
+        self._failed: List[Dict] = []
+        self._error: Optional[Exception] = None
+        self._snapshot: Optional[Callable[[], State]] = None
+        self._generation = 0
+        self._writing = False
+        self._flushing = False
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> State:
+        # Runs with the lock held, so it cannot wait for the writer thread (which
+        # needs the lock too); records not written yet are replayed over the file.
+        tasks, next_id = self.storage.load()
+        with self._cond:
+            unwritten = self._failed + self._inflight + self._pending
+        for record in unwritten:
+            if record["op"] == "add":
+                record = dict(record, task=dict(record["task"]))
+                next_id = max(next_id, record["task"]["id"] + 1)
+            apply_record(tasks, record)
+        return tasks, next_id
+
+    def lock(self) -> FileLock:
+        return self.storage.lock()
+
+    def changes(self) -> Optional[List[Dict]]:
+        return self.storage.changes()
+
+    def save(self, tasks: Dict[int, Dict], next_id: int) -> None:
+        # A full save supersedes everything queued; a write the thread already
+        # picked up sees the new generation and is dropped.
+        with self.storage.lock():
+            with self._cond:
+                self._pending = []
+                self._inflight = []
+                self._failed = []
+                self._error = None
+                self._generation += 1
+            self.storage.save(tasks, next_id)
+
+    def append(self, records: List[Dict], snapshot: Callable[[], State]) -> None:
+        # New ids must reach the file before the caller releases the lock, or another
+        # process could allocate them again; whole-file storages cannot be deferred
+        # without overwriting other processes' changes.
+        if not self.storage.incremental or any(record["op"] == "add" for record in records):
+            try:
+                self.storage.append(records, snapshot)
+            except Exception as e:
+                if self.on_error is None:
+                    raise
+                self.on_error(e)
+            return
+        with self._cond:
+            self._pending.extend(records)
+            self._snapshot = snapshot
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="todo-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        # Records from a failed write are retried; if that fails too, the error is
+        # raised here unless on_error has already been told about it.
+        self._flush(self.on_error is None)
+
+    def _flush(self, raise_error: bool) -> None:
+        with self._cond:
+            if self._failed:
+                self._pending[:0], self._failed = self._failed, []
+            self._flushing = True
+            self._cond.notify_all()
+            while self._pending or self._writing:
+                self._cond.wait()
+            self._flushing = False
+            error, self._error = self._error, None
+        if error is not None and raise_error:
+            raise error
+        self.storage.sync()
+
+    def sync(self) -> None:
+        self.flush()
+
+    def close(self) -> None:
+        # Nothing can report an error after close, so it always raises to the caller.
+        try:
+            self._flush(True)
+        finally:
+            with self._cond:
+                self._closing = True
+                self._cond.notify_all()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+            self.storage.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if self._closing and not self._pending:
+                    return
+                deadline = time.monotonic() + self.debounce
+                while not self._closing and not self._flushing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                records, self._pending, self._failed = self._failed + self._pending, [], []
+                snapshot = self._snapshot
+                generation = self._generation
+                self._inflight = records
+                self._writing = True
+            error = None
+            try:
+                with self.storage.lock():
+                    if generation == self._generation:
+                        self.storage.append(records, snapshot)
+                with self._cond:
+                    self._error = None
+            except Exception as e:
+                # Keep the records so the next write or flush() retries them.
+                error = e
+                with self._cond:
+                    if generation == self._generation:
+                        self._failed = records
+                    self._error = e
+            finally:
+                with self._cond:
+                    self._inflight = []
+                    self._writing = False
+                    self._cond.notify_all()
+            # Only after waiters are released: on_error runs on this thread and must
+            # not block on anything a flush() caller holds.
+            if error is not None and self.on_error is not None:
+                try:
+                    self.on_error(error)
+                except Exception:
+                    pass
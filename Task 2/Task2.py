@@ -1,3 +1,5 @@
+import sys
+
 def perform_calculation(num1, num2, operation):
     if operation == '1':
         return num1 + num2
@@ -12,7 +14,29 @@ def perform_calculation(num1, num2, operation):
     else:
         raise ValueError("Invalid operation selected!")
 
+def evaluate_expression():
+    from expression import compile_expression
+
+    text = input("\nEnter expression: ")
+    expression = compile_expression(text)
+    env = {}
+    for name in sorted(expression.variables):
+        env[name] = float(input(f"Enter value for {name}: "))
+    
+    print(f"\nResult: {text} = {expression.evaluate(env)}")
+
 def main():
+    if sys.argv[1:2] == ["--batch"]:
+        from batch import stream_csv
+        stream_csv(sys.stdin, sys.stdout)
+        return
+    if sys.argv[1:2] == ["--expr"]:
+        try:
+            evaluate_expression()
+        except ValueError as e:
+            print(f"\nError: {str(e)}")
+        return
+
     print("\n=== Simple Calculator ===")
     print("1. Addition (+)")
     print("2. Subtraction (-)")
@@ -0,0 +1,115 @@
+import csv
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OPERATORS = {
+    '1': operator.add,
+    '2': operator.sub,
+    '3': operator.mul,
+    '4': operator.truediv,
+}
+NAN = float('nan')
+
+
+def _check_operations(operations):
+    invalid = set(operations) - set(OPERATORS)
+    if invalid:
+        raise ValueError(f"Invalid operation selected: {sorted(map(str, invalid))}")
+
+
+def _calculate_python(num1s, num2s, operations):
+    ops = OPERATORS
+    results = [
+        ops[op](a, b) if b or op != '4' else NAN
+        for a, b, op in zip(num1s, num2s, operations)
+    ]
+    zero_mask = [op == '4' and not b for b, op in zip(num2s, operations)]
+    return results, zero_mask
+
+
+def _calculate_numpy(num1s, num2s, operations):
+    a = np.asarray(num1s, dtype=float)
+    b = np.asarray(num2s, dtype=float)
+    codes = np.asarray(operations).astype(np.int8)
+    if codes.size and (codes.min() < 1 or codes.max() > 4):
+        raise ValueError("Invalid operation selected!")
+
+    results = np.empty_like(a)
+    for code, func in ((1, np.add), (2, np.subtract), (3, np.multiply)):
+        mask = codes == code
+        results[mask] = func(a[mask], b[mask])
+
+    division = codes == 4
+    zero_mask = division & (b == 0)
+    safe = division & ~zero_mask
+    results[safe] = a[safe] / b[safe]
+    results[zero_mask] = np.nan
+    return results, zero_mask
+
+
+def calculate_batch(num1s, num2s, operations, use_numpy=None):
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return _calculate_numpy(num1s, num2s, operations)
+
+    if not set(operations) <= OPERATORS.keys():
+        operations = [str(op) for op in operations]
+        _check_operations(operations)
+    return _calculate_python(num1s, num2s, operations)
+
+
+def _parse_row(row):
+    if len(row) != 3:
+        raise ValueError("expected num1,num2,operation")
+    num1, num2, operation = float(row[0]), float(row[1]), row[2].strip()
+    if operation not in OPERATORS:
+        raise ValueError("Invalid operation selected!")
+    return num1, num2, operation
+
+
+def stream_csv(infile, outfile, chunk_size=65536, use_numpy=None):
+    reader = csv.reader(infile)
+    writer = csv.writer(outfile)
+    writer.writerow(["num1", "num2", "operation", "result", "error"])
+
+    def flush(chunk):
+        valid = [parsed for _, parsed in chunk if not isinstance(parsed, str)]
+        if valid:
+            num1s, num2s, operations = zip(*valid)
+            results, zero_mask = calculate_batch(num1s, num2s, operations, use_numpy)
+        position = 0
+        rows = []
+        for row, parsed in chunk:
+            if isinstance(parsed, str):
+                rows.append(row[:3] + [""] * (3 - len(row[:3])) + ["", parsed])
+                continue
+            if zero_mask[position]:
+                rows.append(row[:3] + ["", "Cannot divide by zero!"])
+            else:
+                rows.append(row[:3] + [repr(float(results[position])), ""])
+            position += 1
+        writer.writerows(rows)
+
+    chunk = []
+    for line_number, row in enumerate(reader):
+        if not row:
+            continue
+        try:
+            parsed = _parse_row(row)
+        except ValueError as e:
+            if line_number == 0:
+                continue
+            parsed = str(e)
+        chunk.append((row, parsed))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
@@ -0,0 +1,44 @@
+import random
+import sys
+import time
+
+from Task2 import perform_calculation
+from batch import calculate_batch, np
+
+ROWS = 1_000_000
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<20} {elapsed:8.3f} s  {rows / elapsed / 1e6:8.2f} M rows/s")
+
+
+def per_call(num1s, num2s, operations):
+    for a, b, op in zip(num1s, num2s, operations):
+        try:
+            perform_calculation(a, b, op)
+        except ValueError:
+            pass
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    rng = random.Random(42)
+    num1s = [rng.uniform(-1000, 1000) for _ in range(rows)]
+    num2s = [rng.choice([0.0, rng.uniform(-1000, 1000)]) for _ in range(rows)]
+    operations = [rng.choice("1234") for _ in range(rows)]
+
+    print(f"{rows} rows")
+    timed("per-call", lambda: per_call(num1s, num2s, operations), rows)
+    timed("batched (python)", lambda: calculate_batch(num1s, num2s, operations, use_numpy=False), rows)
+    if np is not None:
+        a, b, codes = np.array(num1s), np.array(num2s), np.array(operations)
+        timed("batched (numpy)", lambda: calculate_batch(a, b, codes, use_numpy=True), rows)
+    else:
+        print("batched (numpy)      skipped, NumPy not installed")
+
+
+if __name__ == "__main__":
+    main()
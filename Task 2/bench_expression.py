@@ -0,0 +1,70 @@
+import math
+import random
+import sys
+import time
+
+from expression import CompiledExpression, compile_expression
+
+EXPRESSION = "(a + b) * c / d - -(2 * 3 + 1)"
+BINDINGS = 200_000
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f} s  {count / elapsed:12,.0f} evals/s")
+
+
+def expect_error(text, env=None):
+    try:
+        CompiledExpression(text).evaluate(env or {})
+    except ValueError:
+        return
+    raise AssertionError(f"{text[:40]!r} should raise ValueError")
+
+
+def check():
+    # Edge cases first, so a broken compiler fails loudly instead of timing garbage.
+    env = {"a": 3.0, "b": 4.0, "c": 2.0, "d": 5.0}
+    assert CompiledExpression(EXPRESSION).evaluate(env) == (3.0 + 4.0) * 2.0 / 5.0 + 7
+    assert CompiledExpression("1e999").evaluate({}) == math.inf
+    assert CompiledExpression("1e308 * 10").evaluate({}) == math.inf
+    assert math.isnan(CompiledExpression("1e999 - 1e999").evaluate({}))
+    for terms in (250, 20_000):
+        assert CompiledExpression(" + ".join(["x"] * terms)).evaluate({"x": 1.5}) == 1.5 * terms
+    expect_error("(" * 5000 + "1" + ")" * 5000)
+    expect_error("-" * 3000 + "1")
+    expect_error("1 / 0")
+    expect_error("a + 1")
+
+
+def main():
+    check()
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else BINDINGS
+    rng = random.Random(42)
+    bindings = [
+        {"a": rng.random(), "b": rng.random(), "c": rng.random(), "d": rng.random() + 1}
+        for _ in range(count)
+    ]
+
+    def uncached():
+        for env in bindings:
+            CompiledExpression(EXPRESSION).evaluate(env)
+
+    def cached():
+        for env in bindings:
+            compile_expression(EXPRESSION).evaluate(env)
+
+    def compiled_once():
+        for _ in compile_expression(EXPRESSION).evaluate_many(bindings):
+            pass
+
+    print(f"{EXPRESSION!r} over {count} bindings")
+    timed("uncached (parse every time)", uncached, count)
+    timed("cached lookup per binding", cached, count)
+    timed("compiled once, evaluate_many", compiled_once, count)
+
+
+if __name__ == "__main__":
+    main()
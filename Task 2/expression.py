@@ -0,0 +1,194 @@
+import re
+from functools import lru_cache
+
+from Task2 import perform_calculation
+
+TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_]\w*)|(.))")
+OPERATION_CODES = {'+': '1', '-': '2', '*': '3', '/': '4'}
+
+
+def tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_RE.match(text, position)
+        number, name, symbol = match.groups()
+        if number:
+            tokens.append(('num', float(number)))
+        elif name:
+            tokens.append(('var', name))
+        elif symbol in OPERATION_CODES or symbol in '()':
+            tokens.append(('op', symbol))
+        else:
+            raise ValueError(f"Unexpected character {symbol!r} in expression")
+        position = match.end()
+    return tokens
+
+
+class Parser:
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Expression is empty")
+        node = self.expression()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected token {self.peek()[1]!r}")
+        return node
+
+    def expression(self):
+        node = self.term()
+        while self.peek() in (('op', '+'), ('op', '-')):
+            symbol = self.take()[1]
+            node = ('bin', OPERATION_CODES[symbol], node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() in (('op', '*'), ('op', '/')):
+            symbol = self.take()[1]
+            node = ('bin', OPERATION_CODES[symbol], node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek() == ('op', '-'):
+            self.take()
+            return ('neg', self.unary())
+        if self.peek() == ('op', '+'):
+            self.take()
+            return self.unary()
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind in ('num', 'var'):
+            return (kind, value)
+        if (kind, value) == ('op', '('):
+            node = self.expression()
+            if self.take() != ('op', ')'):
+                raise ValueError("Missing closing parenthesis")
+            return node
+        raise ValueError("Unexpected end of expression" if kind is None else f"Unexpected token {value!r}")
+
+
+def _postorder(tree):
+    # Children before parents, without recursion: a chain like a+b+c+... parses
+    # into a left-deep tree that is as deep as the expression is long.
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+        else:
+            stack.append((node, True))
+            if node[0] == 'bin':
+                stack.append((node[3], False))
+                stack.append((node[2], False))
+            elif node[0] == 'neg':
+                stack.append((node[1], False))
+
+
+def fold_constants(tree):
+    folded = {}
+    for node in _postorder(tree):
+        kind = node[0]
+        result = node
+        if kind == 'neg':
+            operand = folded[id(node[1])]
+            result = ('num', -operand[1]) if operand[0] == 'num' else ('neg', operand)
+        elif kind == 'bin':
+            code, left, right = node[1], folded[id(node[2])], folded[id(node[3])]
+            result = ('bin', code, left, right)
+            if left[0] == 'num' and right[0] == 'num':
+                try:
+                    result = ('num', perform_calculation(left[1], right[1], code))
+                except ValueError:
+                    pass
+        folded[id(node)] = result
+    return folded[id(tree)]
+
+
+def variables(tree):
+    return {node[1] for node in _postorder(tree) if node[0] == 'var'}
+
+
+def to_source(tree, constants):
+    # One assignment per operator inside a def, so the generated code stays flat
+    # however long the expression is. Constants are passed in through the
+    # constants list rather than printed, since repr(inf) is not valid source.
+    lines = []
+    operands = {}
+    for node in _postorder(tree):
+        kind = node[0]
+        if kind == 'num':
+            operands[id(node)] = f"K[{len(constants)}]"
+            constants.append(node[1])
+            continue
+        if kind == 'var':
+            operands[id(node)] = f"env[{node[1]!r}]"
+            continue
+        temp = f"t{len(lines)}"
+        if kind == 'neg':
+            lines.append(f"    {temp} = -{operands[id(node[1])]}")
+        else:
+            lines.append(f"    {temp} = calc({operands[id(node[2])]}, {operands[id(node[3])]}, {node[1]!r})")
+        operands[id(node)] = temp
+    lines.append(f"    return {operands[id(tree)]}")
+    return "def expression(env, calc=calc, K=K):\n" + "\n".join(lines)
+
+
+class CompiledExpression:
+    def __init__(self, text):
+        self.text = text
+        try:
+            self.tree = fold_constants(Parser(text).parse())
+        except RecursionError:
+            raise ValueError("Expression is nested too deeply") from None
+        self.variables = frozenset(variables(self.tree))
+        constants = []
+        source = to_source(self.tree, constants)
+        namespace = {"calc": perform_calculation, "K": tuple(constants), "__builtins__": {}}
+        try:
+            exec(compile(source, "<expression>", "exec"), namespace)
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            raise ValueError(f"Expression could not be compiled: {e}") from None
+        self.function = namespace["expression"]
+
+    def evaluate(self, env):
+        try:
+            return self.function(env)
+        except KeyError as e:
+            raise ValueError(f"No value given for variable {e.args[0]!r}") from None
+
+    def evaluate_many(self, bindings):
+        function = self.function
+        try:
+            for env in bindings:
+                yield function(env)
+        except KeyError as e:
+            raise ValueError(f"No value given for variable {e.args[0]!r}") from None
+
+    def __call__(self, **env):
+        return self.evaluate(env)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    return CompiledExpression(text)
+
+
+def evaluate(text, **env):
+    return compile_expression(text).evaluate(env)
@@ -1,41 +1,73 @@
-import random
-import string
+import argparse
+import sys
+
+from password_stream import generate_passwords
 
 def generate_password(length, use_lowercase=True, use_uppercase=True, use_digits=True, use_special=True):
-    if length < 4:
-        raise ValueError("Password length must be at least 4 characters")
-    
-    characters = ""
-    if use_lowercase:
-        characters += string.ascii_lowercase
-    if use_uppercase:
-        characters += string.ascii_uppercase
-    if use_digits:
-        characters += string.digits
-    if use_special:
-        characters += "!@#$%^&*()_+-=[]{}|;:,.<>?"
-    
-    if not characters:
-        raise ValueError("At least one character type must be selected")
-    
-    password = []
-    
-    if use_lowercase:
-        password.append(random.choice(string.ascii_lowercase))
-    if use_uppercase:
-        password.append(random.choice(string.ascii_uppercase))
-    if use_digits:
-        password.append(random.choice(string.digits))
-    if use_special:
-        password.append(random.choice("!@#$%^&*()_+-=[]{}|;:,.<>?"))
-    
-    while len(password) < length:
-        password.append(random.choice(characters))
-    
-    random.shuffle(password)
-    return ''.join(password)
+    # A small block: the default is sized for bulk runs and would waste urandom on one password.
+    return next(generate_passwords(1, length, use_lowercase, use_uppercase, use_digits, use_special,
+                                   block_size=64))
+
+def run_batch(argv):
+    from parallel import generate_parallel, write_parallel
+    from password_stream import write_passwords
+
+    parser = argparse.ArgumentParser(description="Generate passwords in bulk")
+    parser.add_argument("--count", type=int, required=True, help="number of passwords")
+    parser.add_argument("--length", type=int, default=16, help="password length")
+    parser.add_argument("--output", help="file to write passwords to (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (0 = one per CPU)")
+    parser.add_argument("--history", metavar="DIR",
+                        help="never issue a password recorded in this history directory")
+    parser.add_argument("--capacity", type=int, default=1_000_000,
+                        help="passwords the history is sized for before it grows")
+    parser.add_argument("--no-lowercase", action="store_true")
+    parser.add_argument("--no-uppercase", action="store_true")
+    parser.add_argument("--no-digits", action="store_true")
+    parser.add_argument("--no-special", action="store_true")
+    args = parser.parse_args(argv)
+    if args.count < 0:
+        parser.error("--count cannot be negative")
+    if args.history and args.workers != 1:
+        parser.error("--workers cannot be combined with --history, which records passwords one at a time")
+
+    options = {
+        "use_lowercase": not args.no_lowercase,
+        "use_uppercase": not args.no_uppercase,
+        "use_digits": not args.no_digits,
+        "use_special": not args.no_special,
+    }
+    if args.history:
+        from issuance import IssuanceHistory, issue_passwords
+        with IssuanceHistory(args.history, args.capacity) as history:
+            passwords = issue_passwords(history, args.count, args.length, **options)
+            if args.output:
+                with open(args.output, 'w') as f:
+                    f.writelines(password + "\n" for password in passwords)
+            else:
+                for password in passwords:
+                    sys.stdout.write(password + "\n")
+    elif args.output and args.workers != 1:
+        write_parallel(args.output, args.count, args.length, args.workers or None, **options)
+    elif args.output:
+        write_passwords(args.output, args.count, args.length, **options)
+    elif args.workers != 1:
+        for chunk in generate_parallel(args.count, args.length, args.workers or None, **options):
+            sys.stdout.write("\n".join(chunk) + "\n")
+    else:
+        for password in generate_passwords(args.count, args.length, **options):
+            sys.stdout.write(password + "\n")
 
 def main():
+    if len(sys.argv) > 1:
+        try:
+            run_batch(sys.argv[1:])
+        except ValueError as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     print("\n=== Password Generator ===")
     
     try:
@@ -57,8 +89,11 @@ def main():
         
         print(f"\nGenerated Password: {password}")
         
-        password_strength = len(set(password)) / len(password) * 100
-        print(f"Password Strength: {password_strength:.1f}%")
+        from strength import estimate_strength
+        strength = estimate_strength(password)
+        print(f"Password Strength: {strength.rating} ({strength.bits:.0f} bits of entropy)")
+        for warning in strength.warnings:
+            print(f"  - {warning}")
         
     except ValueError as e:
         print(f"\nError: {str(e)}")
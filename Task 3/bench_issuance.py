@@ -0,0 +1,51 @@
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from issuance import IssuanceHistory, issue_passwords
+from password_stream import generate_passwords
+
+COUNT = 200_000
+LENGTH = 16
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else LENGTH
+
+    with tempfile.TemporaryDirectory() as directory:
+        with IssuanceHistory(directory, capacity=count) as history:
+            start = time.perf_counter()
+            for _ in issue_passwords(history, count, length):
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"{count} passwords of length {length}")
+            print(f"{'issue (fresh)':<32} {elapsed:8.3f} s  {count / elapsed:12,.0f} passwords/s")
+            print(f"{'exact lookups':<32} {history.exact_lookups:8}  "
+                  f"({history.exact_lookups / count:.2%} Bloom false positives)")
+
+            # Four-digit PINs exhaust their space quickly, so most late draws collide.
+            start = time.perf_counter()
+            issued = sum(1 for _ in issue_passwords(history, 9000, 4, use_lowercase=False,
+                                                    use_uppercase=False, use_special=False))
+            elapsed = time.perf_counter() - start
+            print(f"{'issue 9000 of 10**4 PINs':<32} {elapsed:8.3f} s  "
+                  f"{history.collisions} collisions regenerated, {issued} issued")
+
+            probe = list(generate_passwords(count, length))
+            start = time.perf_counter()
+            for password in probe:
+                password in history
+            elapsed = time.perf_counter() - start
+            print(f"{'membership (misses)':<32} {elapsed:8.3f} s  {count / elapsed:12,.0f} lookups/s")
+
+            for name in ("history.bloom", "history.table"):
+                size = os.path.getsize(os.path.join(directory, name))
+                print(f"{name:<32} {size / 2 ** 20:8.1f} MiB on disk  ({size / len(history):.1f} B/password)")
+        print(f"{'peak RSS':<32} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
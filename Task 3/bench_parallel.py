@@ -0,0 +1,25 @@
+import os
+import sys
+import time
+
+from parallel import generate_parallel
+
+COUNT = 1_000_000
+LENGTH = 16
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus})
+
+    print(f"{count} passwords of length {LENGTH}, {cpus} CPUs")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        produced = sum(len(chunk) for chunk in generate_parallel(count, LENGTH, workers))
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers  {elapsed:8.3f} s  {produced / elapsed:12,.0f} passwords/s")
+
+
+if __name__ == "__main__":
+    main()
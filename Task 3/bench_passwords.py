@@ -0,0 +1,36 @@
+import sys
+import time
+
+from Task3 import generate_password
+from password_stream import generate_passwords
+
+COUNT = 200_000
+LENGTH = 16
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f} s  {count / elapsed:12,.0f} passwords/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else LENGTH
+
+    def per_call():
+        for _ in range(count):
+            generate_password(length)
+
+    def bulk():
+        for _ in generate_passwords(count, length):
+            pass
+
+    print(f"{count} passwords of length {length}")
+    timed("generate_password (random)", per_call, count)
+    timed("generate_passwords (urandom)", bulk, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import math
+import mmap
+import os
+import struct
+from hashlib import blake2b
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from password_stream import generate_passwords
+
+KEY_SIZE = 32
+DIGEST_SIZE = 16
+EMPTY_SLOT = bytes(DIGEST_SIZE)
+MAX_LOAD = 0.7
+# At 99% of a password space used, 1000 draws in a row collide about once in 23,000 runs.
+MAX_CONSECUTIVE_COLLISIONS = 1000
+
+BLOOM_MAGIC = b"PWBLOOM1"
+TABLE_MAGIC = b"PWHIST01"
+# Written while a table is open; finding it on open means the last issuer crashed.
+TABLE_DIRTY = b"PWHIST0~"
+HEADER = struct.Struct("<8sQQ")
+
+
+def _create(path, magic, a, b, size):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(magic, a, b))
+        f.truncate(HEADER.size + size)
+
+
+class _MappedFile:
+    def __init__(self, path, magic, *aliases):
+        self.path = path
+        self.file = open(path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.magic, self.a, self.b = HEADER.unpack_from(self.map)
+        if self.magic != magic and self.magic not in aliases:
+            self.map.close()
+            self.file.close()
+            raise ValueError(f"{path} is not a {magic.decode()} file")
+
+    def write_header(self, magic):
+        HEADER.pack_into(self.map, 0, magic, self.a, self.b)
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class BloomFilter(_MappedFile):
+    # Header fields: a = number of bits, b = number of hash functions.
+    @staticmethod
+    def create(path, capacity, fp_rate):
+        bits = max(64, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        _create(path, BLOOM_MAGIC, bits, hashes, (bits + 7) // 8)
+
+    def __init__(self, path):
+        super().__init__(path, BLOOM_MAGIC)
+        self.bits, self.hashes = self.a, self.b
+
+    def positions(self, digest):
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits + HEADER.size * 8 for i in range(self.hashes)]
+
+    def might_contain(self, digest, positions=None):
+        data = self.map
+        for p in positions or self.positions(digest):
+            if not data[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, digest, positions=None):
+        data = self.map
+        for p in positions or self.positions(digest):
+            data[p >> 3] |= 1 << (p & 7)
+
+
+class HashTable(_MappedFile):
+    # Open addressing with linear probing over fixed 16-byte slots.
+    # Header fields: a = slot count (a power of two), b = stored digests.
+    @staticmethod
+    def create(path, capacity):
+        slots = 1 << max(4, math.ceil(math.log2(capacity / MAX_LOAD)))
+        _create(path, TABLE_MAGIC, slots, 0, slots * DIGEST_SIZE)
+
+    def __init__(self, path):
+        super().__init__(path, TABLE_MAGIC, TABLE_DIRTY)
+        self.slots = self.a
+        self.mask = self.slots - 1
+        if self.magic == TABLE_DIRTY:
+            # The count in the header may predate the last digests written.
+            self.b = sum(1 for _ in self.digests())
+        self.count = self.b
+        self.write_header(TABLE_DIRTY)
+
+    def __len__(self):
+        return self.count
+
+    def _find(self, digest):
+        data = self.map
+        i = int.from_bytes(digest[8:], 'little') & self.mask
+        for _ in range(self.slots):
+            offset = HEADER.size + i * DIGEST_SIZE
+            slot = data[offset:offset + DIGEST_SIZE]
+            if slot == digest or slot == EMPTY_SLOT:
+                return offset, slot == digest
+            i = (i + 1) & self.mask
+        raise ValueError(f"{self.path} has no free slot left")
+
+    def __contains__(self, digest):
+        return self._find(digest)[1]
+
+    def add(self, digest):
+        offset, found = self._find(digest)
+        if found:
+            return False
+        self.map[offset:offset + DIGEST_SIZE] = digest
+        self.count += 1
+        self.b = self.count
+        return True
+
+    def full(self):
+        return self.count + 1 > self.slots * MAX_LOAD
+
+    def digests(self):
+        data = self.map
+        for offset in range(HEADER.size, HEADER.size + self.slots * DIGEST_SIZE, DIGEST_SIZE):
+            slot = data[offset:offset + DIGEST_SIZE]
+            if slot != EMPTY_SLOT:
+                yield slot
+
+    def flush(self):
+        self.write_header(TABLE_DIRTY)
+        super().flush()
+
+    def close(self):
+        self.write_header(TABLE_MAGIC)
+        super().flush()
+        super().close()
+
+
+class IssuanceHistory:
+    def __init__(self, directory, capacity=1_000_000, fp_rate=0.01):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fp_rate = fp_rate
+        self._lock = self._acquire(os.path.join(directory, "history.lock"))
+        try:
+            self.key = self._load_key(os.path.join(directory, "history.key"))
+            self.bloom_path = os.path.join(directory, "history.bloom")
+            self.table_path = os.path.join(directory, "history.table")
+            if not os.path.exists(self.table_path):
+                HashTable.create(self.table_path, capacity)
+                BloomFilter.create(self.bloom_path, capacity, fp_rate)
+            elif not os.path.exists(self.bloom_path):
+                table = HashTable(self.table_path)
+                try:
+                    self._rebuild_bloom(table, capacity)
+                finally:
+                    table.close()
+            self.table = HashTable(self.table_path)
+            self.bloom = BloomFilter(self.bloom_path)
+        except BaseException:
+            self._lock.close()
+            raise
+        self.exact_lookups = 0
+        self.collisions = 0
+
+    @staticmethod
+    def _acquire(path):
+        # One issuer per history: another could hand out a password this one has
+        # not recorded yet, or replace the files under it while growing.
+        f = open(path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            raise ValueError(f"{os.path.dirname(path)} is in use by another issuer")
+        return f
+
+    @staticmethod
+    def _load_key(path):
+        try:
+            with open(path, 'rb') as f:
+                key = f.read()
+            if len(key) != KEY_SIZE:
+                raise ValueError(f"{path} does not hold a {KEY_SIZE}-byte key")
+            return key
+        except FileNotFoundError:
+            key = os.urandom(KEY_SIZE)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key)
+            return key
+
+    def digest(self, password):
+        digest = blake2b(password.encode('utf-8'), key=self.key, digest_size=DIGEST_SIZE).digest()
+        return digest if digest != EMPTY_SLOT else b"\x01" + digest[1:]
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, password):
+        digest = self.digest(password)
+        if not self.bloom.might_contain(digest):
+            return False
+        self.exact_lookups += 1
+        return digest in self.table
+
+    def add(self, password):
+        digest = self.digest(password)
+        positions = self.bloom.positions(digest)
+        if self.bloom.might_contain(digest, positions):
+            self.exact_lookups += 1
+            if digest in self.table:
+                self.collisions += 1
+                return False
+        if self.table.full():
+            self._grow()
+            positions = None
+        # Bloom bits first: after a crash the filter may over-report, never under-report.
+        self.bloom.add(digest, positions)
+        self.table.add(digest)
+        return True
+
+    def _grow(self):
+        old = self.table
+        capacity = old.slots * 2 * MAX_LOAD
+        tmp = self.table_path + ".tmp"
+        HashTable.create(tmp, capacity)
+        new = HashTable(tmp)
+        for digest in old.digests():
+            new.add(digest)
+        new.flush()
+        new.close()
+        old.close()
+        self.bloom.close()
+        os.replace(tmp, self.table_path)
+        self.table = HashTable(self.table_path)
+        self._rebuild_bloom(self.table, capacity)
+        self.bloom = BloomFilter(self.bloom_path)
+
+    def _rebuild_bloom(self, table, capacity):
+        tmp = self.bloom_path + ".tmp"
+        BloomFilter.create(tmp, capacity, self.fp_rate)
+        bloom = BloomFilter(tmp)
+        for digest in table.digests():
+            bloom.add(digest)
+        bloom.flush()
+        bloom.close()
+        os.replace(tmp, self.bloom_path)
+
+    def sync(self):
+        self.bloom.flush()
+        self.table.flush()
+
+    def close(self):
+        self.sync()
+        self.bloom.close()
+        self.table.close()
+        self._lock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def issue_passwords(history, count, length, **options):
+    if count < 0:
+        raise ValueError("Password count cannot be negative")
+    issued = 0
+    collisions = 0
+    while issued < count:
+        for password in generate_passwords(count - issued, length, **options):
+            if history.add(password):
+                issued += 1
+                collisions = 0
+                yield password
+            else:
+                collisions += 1
+                if collisions >= MAX_CONSECUTIVE_COLLISIONS:
+                    raise ValueError(
+                        f"{collisions} passwords in a row were already issued; "
+                        f"the {length}-character password space is nearly exhausted"
+                    )
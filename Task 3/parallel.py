@@ -0,0 +1,48 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from password_stream import generate_passwords
+
+CHUNK_SIZE = 50_000
+
+
+def shard_sizes(count, chunk_size=CHUNK_SIZE):
+    full, remainder = divmod(count, chunk_size)
+    return [chunk_size] * full + ([remainder] if remainder else [])
+
+
+def _generate_shard(size, length, options):
+    return list(generate_passwords(size, length, **options))
+
+
+def generate_parallel(count, length, workers=None, chunk_size=CHUNK_SIZE, **options):
+    if length < 4:
+        raise ValueError("Password length must be at least 4 characters")
+    if count < 0:
+        raise ValueError("Password count cannot be negative")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for size in shard_sizes(count, chunk_size):
+            yield _generate_shard(size, length, options)
+        return
+
+    shards = iter(shard_sizes(count, chunk_size))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        running = set()
+        while True:
+            while len(running) < workers * 2:
+                size = next(shards, None)
+                if size is None:
+                    break
+                running.add(executor.submit(_generate_shard, size, length, options))
+            if not running:
+                return
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def write_parallel(filename, count, length, workers=None, **options):
+    with open(filename, 'w') as f:
+        for chunk in generate_parallel(count, length, workers, **options):
+            f.write("\n".join(chunk) + "\n")
@@ -0,0 +1,79 @@
+import os
+import string
+from functools import lru_cache
+
+SPECIAL_CHARACTERS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+BLOCK_SIZE = 1 << 16
+
+
+class CharacterPool:
+    def __init__(self, classes):
+        self.classes = [cls.encode('ascii') for cls in classes]
+        self.characters = "".join(classes)
+        size = len(self.characters)
+        limit = 256 - 256 % size
+        self.table = bytes(
+            ord(self.characters[b % size]) if b < limit else 0 for b in range(256)
+        )
+        self.rejected = bytes(range(limit, 256))
+
+    def sample(self, nbytes):
+        return os.urandom(nbytes).translate(self.table, self.rejected)
+
+    def covers_all_classes(self, candidate):
+        length = len(candidate)
+        for cls in self.classes:
+            if len(candidate.translate(None, cls)) == length:
+                return False
+        return True
+
+
+@lru_cache(maxsize=None)
+def character_pool(use_lowercase=True, use_uppercase=True, use_digits=True, use_special=True):
+    classes = [
+        characters for characters, selected in (
+            (string.ascii_lowercase, use_lowercase),
+            (string.ascii_uppercase, use_uppercase),
+            (string.digits, use_digits),
+            (SPECIAL_CHARACTERS, use_special),
+        ) if selected
+    ]
+    if not classes:
+        raise ValueError("At least one character type must be selected")
+    return CharacterPool(classes)
+
+
+def generate_passwords(count, length, use_lowercase=True, use_uppercase=True, use_digits=True,
+                       use_special=True, block_size=BLOCK_SIZE):
+    if length < 4:
+        raise ValueError("Password length must be at least 4 characters")
+    pool = character_pool(use_lowercase, use_uppercase, use_digits, use_special)
+    block_size = max(block_size, length * 2)
+
+    produced = 0
+    buffer = b""
+    while produced < count:
+        buffer += pool.sample(block_size)
+        end = len(buffer) - length + 1
+        start = 0
+        while start < end:
+            candidate = buffer[start:start + length]
+            start += length
+            if pool.covers_all_classes(candidate):
+                yield candidate.decode('ascii')
+                produced += 1
+                if produced == count:
+                    return
+        buffer = buffer[start:]
+
+
+def write_passwords(filename, count, length, **options):
+    chunk = []
+    with open(filename, 'w') as f:
+        for password in generate_passwords(count, length, **options):
+            chunk.append(password)
+            if len(chunk) >= 10000:
+                f.write("\n".join(chunk) + "\n")
+                chunk = []
+        if chunk:
+            f.write("\n".join(chunk) + "\n")
@@ -0,0 +1,200 @@
+import math
+import mmap
+import os
+import re
+import string
+import sys
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from hashlib import blake2b
+from itertools import islice
+
+from password_stream import SPECIAL_CHARACTERS
+
+INDEX_MAGIC = b"PWDIDX01"
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "common_passwords.idx")
+
+BUILTIN_COMMON = """
+123456 password 12345678 qwerty 123456789 12345 1234 111111 1234567 dragon 123123 baseball
+abc123 football monkey letmein 696969 shadow master 666666 qwertyuiop 123321 mustang
+1234567890 michael 654321 superman 1qaz2wsx 7777777 121212 000000 qazwsx 123qwe killer
+trustno1 jordan jennifer zxcvbnm asdfgh hunter buster soccer harley batman andrew tigger
+sunshine iloveyou 2000 charlie robert thomas hockey ranger daniel starwars klaster 112233
+george computer michelle jessica pepper 1111 zxcvbn 555555 11111111 131313 freedom 777777
+pass maggie 159753 aaaaaa ginger princess joshua cheese amanda summer love ashley nicole
+chelsea biteme matthew access yankees 987654321 dallas austin thunder taylor matrix admin
+welcome password1 passw0rd p@ssw0rd qwerty123 abc12345 login changeme secret
+""".split()
+
+CLASSES = {
+    'a': string.ascii_lowercase,
+    'A': string.ascii_uppercase,
+    '0': string.digits,
+    '!': SPECIAL_CHARACTERS,
+}
+CLASS_TABLE = str.maketrans({c: code for code, characters in CLASSES.items() for c in characters})
+OTHER_POOL = 33
+
+KEYBOARD_ROWS = ("`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./")
+SEQUENCES = (string.ascii_lowercase, string.digits) + KEYBOARD_ROWS
+
+
+def _pattern_trigrams():
+    trigrams = set()
+    for sequence in SEQUENCES:
+        for text in (sequence, sequence[::-1]):
+            for i in range(len(text) - 2):
+                trigrams.add(text[i:i + 3])
+    return frozenset(trigrams)
+
+
+PATTERN_TRIGRAMS = _pattern_trigrams()
+REPEAT_RE = re.compile(r"(.)\1{2,}")
+
+RATINGS = ((28, "Very weak"), (36, "Weak"), (60, "Reasonable"), (128, "Strong"))
+
+Strength = namedtuple("Strength", ["bits", "rating", "warnings"])
+
+
+def password_hash(password):
+    return int.from_bytes(blake2b(password.lower().encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def build_index(wordlist_path, index_path=DEFAULT_INDEX):
+    hashes = array('Q')
+    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.rstrip("\r\n")
+            if word:
+                hashes.append(password_hash(word))
+    unique = array('Q', sorted(set(hashes)))
+    with open(index_path, 'wb') as f:
+        f.write(INDEX_MAGIC)
+        unique.tofile(f)
+    return len(unique)
+
+
+class CommonPasswordIndex:
+    def __init__(self, index_path=DEFAULT_INDEX):
+        self.path = index_path
+        self._file = open(index_path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{index_path} is not a password index")
+        self._hashes = memoryview(self._mmap)[len(INDEX_MAGIC):].cast('Q')
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, password):
+        value = password_hash(password)
+        i = bisect_left(self._hashes, value)
+        return i < len(self._hashes) and self._hashes[i] == value
+
+    def close(self):
+        self._hashes.release()
+        self._mmap.close()
+        self._file.close()
+
+
+class BuiltinPasswordList:
+    def __init__(self, words=BUILTIN_COMMON):
+        self._words = frozenset(word.lower() for word in words)
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, password):
+        return password.lower() in self._words
+
+
+def load_common_passwords(index_path=DEFAULT_INDEX):
+    if os.path.exists(index_path):
+        return CommonPasswordIndex(index_path)
+    return BuiltinPasswordList()
+
+
+_common_passwords = None
+
+
+def common_passwords():
+    global _common_passwords
+    if _common_passwords is None:
+        _common_passwords = load_common_passwords()
+    return _common_passwords
+
+
+_bits_per_character = {}
+
+
+def bits_per_character(password):
+    signature = frozenset(password.translate(CLASS_TABLE))
+    bits = _bits_per_character.get(signature)
+    if bits is None:
+        size = sum(len(CLASSES[code]) for code in signature if code in CLASSES)
+        if not signature <= CLASSES.keys():
+            size += OTHER_POOL
+        bits = _bits_per_character[signature] = math.log2(size)
+    return bits
+
+
+def estimate_strength(password, dictionary=None):
+    if not password:
+        return Strength(0.0, "Very weak", ["Password is empty"])
+    dictionary = common_passwords() if dictionary is None else dictionary
+
+    if password in dictionary:
+        bits = math.log2(max(len(dictionary), 2))
+        return Strength(bits, _rating(bits), ["Password is in the common password list"])
+
+    warnings = []
+    predictable = set()
+    lowered = password.lower()
+    if not PATTERN_TRIGRAMS.isdisjoint(map(''.join, zip(lowered, lowered[1:], lowered[2:]))):
+        for i, trigram in enumerate(map(''.join, zip(lowered, lowered[1:], lowered[2:]))):
+            if trigram in PATTERN_TRIGRAMS:
+                predictable.update((i, i + 1, i + 2))
+        warnings.append("Contains a sequence or keyboard walk")
+    repeats = 0
+    for match in REPEAT_RE.finditer(password):
+        predictable.update(range(match.start(), match.end()))
+        repeats += 1
+    if repeats:
+        warnings.append("Contains repeated characters")
+
+    guessable = len(predictable)
+    bits = (len(password) - guessable) * bits_per_character(password) + guessable
+    return Strength(bits, _rating(bits), warnings)
+
+
+def score_many(passwords, dictionary=None):
+    dictionary = common_passwords() if dictionary is None else dictionary
+    return [estimate_strength(password, dictionary) for password in passwords]
+
+
+def _rating(bits):
+    for limit, rating in RATINGS:
+        if bits < limit:
+            return rating
+    return "Very strong"
+
+
+def main(argv):
+    if len(argv) >= 2 and argv[0] == "build":
+        index_path = argv[2] if len(argv) > 2 else DEFAULT_INDEX
+        count = build_index(argv[1], index_path)
+        print(f"Indexed {count} passwords into {index_path}")
+        return
+    if argv:
+        batches = [argv]
+    else:
+        lines = (line.rstrip("\n") for line in sys.stdin)
+        batches = iter(lambda: list(islice(lines, 10000)), [])
+    for batch in batches:
+        for password, strength in zip(batch, score_many(batch)):
+            print(f"{strength.bits:6.1f} bits  {strength.rating:<11}  {password}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
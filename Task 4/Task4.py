@@ -1,6 +1,10 @@
-import random
 import time
 import os
+import sys
+
+from engine import MOVES, OUTCOMES, AdaptiveMarkov, resolve
+
+computer = AdaptiveMarkov()
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -31,19 +35,13 @@ def get_user_choice():
         print("\n❌ Invalid choice! Please try again.")
 
 def get_computer_choice():
-    return random.choice(['rock', 'paper', 'scissors'])
+    return MOVES[computer.next_move()]
+
+def record_round(user_choice, computer_choice):
+    computer.observe(MOVES.index(computer_choice), MOVES.index(user_choice))
 
 def determine_winner(user_choice, computer_choice):
-    if user_choice == computer_choice:
-        return 'tie'
-    
-    winning_combinations = {
-        'rock': 'scissors',
-        'paper': 'rock',
-        'scissors': 'paper'
-    }
-    
-    return 'user' if winning_combinations[user_choice] == computer_choice else 'computer'
+    return OUTCOMES[resolve(MOVES.index(user_choice), MOVES.index(computer_choice))]
 
 def display_choices(user_choice, computer_choice):
     symbols = {
@@ -80,6 +78,11 @@ def play_again():
         print("Please enter 'y' or 'n'")
 
 def main():
+    if len(sys.argv) > 1:
+        from engine import main as simulate_main
+        simulate_main(sys.argv[1:])
+        return
+
     user_score = 0
     computer_score = 0
     rounds_played = 0
@@ -99,6 +102,7 @@ def main():
         display_choices(user_choice, computer_choice)
         
         result = determine_winner(user_choice, computer_choice)
+        record_round(user_choice, computer_choice)
         display_result(result)
         
         if result == 'user':
@@ -0,0 +1,73 @@
+import random
+import sys
+import time
+
+from engine import BEATS, AdaptiveMarkov, Biased, Cycle, Strategy, UniformRandom, simulate
+
+ROUNDS = 100_000
+
+
+class WinStayLoseShift(Strategy):
+    name = "win-stay/lose-shift"
+
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        self.move = self.rng.randrange(3)
+
+    def next_move(self):
+        return self.move
+
+    def observe(self, own_move, opponent_move):
+        if own_move == opponent_move or BEATS[own_move] == opponent_move:
+            self.move = self.rng.randrange(3)
+
+
+class NoisyCycle(Cycle):
+    name = "noisy cycle"
+
+    def __init__(self, noise=0.2, rng=None):
+        super().__init__(rng=rng)
+        self.noise = noise
+
+    def next_move(self):
+        move = super().next_move()
+        return self.rng.randrange(3) if self.rng.random() < self.noise else move
+
+
+class AvoidRepeats(Strategy):
+    name = "avoids repeats"
+
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        self.last = None
+
+    def next_move(self):
+        choices = [move for move in range(3) if move != self.last]
+        self.last = self.rng.choice(choices)
+        return self.last
+
+
+PLAYERS = (UniformRandom, Biased, Cycle, NoisyCycle, WinStayLoseShift, AvoidRepeats)
+
+
+def decision_latency(rounds):
+    adaptive = AdaptiveMarkov(rng=random.Random(1))
+    opponent = random.Random(2)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        move = adaptive.next_move()
+        adaptive.observe(move, opponent.randrange(3))
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else ROUNDS
+    print(f"decision + update latency: {decision_latency(rounds):.2f} us/move")
+    print(f"\n{'opponent':<22} {'markov win %':>12} {'opponent win %':>15}")
+    for seed, player in enumerate(PLAYERS):
+        result = simulate(AdaptiveMarkov(rng=random.Random(seed)), player(rng=random.Random(seed + 100)), rounds)
+        print(f"{player.name:<22} {result.win_rate('a'):>12.2%} {result.win_rate('b'):>15.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import random
+from collections import Counter, deque
+
+MOVES = ('rock', 'paper', 'scissors')
+ROCK, PAPER, SCISSORS = range(3)
+OUTCOMES = ('tie', 'user', 'computer')
+
+# RESULTS[a * 3 + b] is 0 for a tie, 1 if move a wins, 2 if move b wins.
+RESULTS = tuple(
+    0 if a == b else (1 if (a - b) % 3 == 1 else 2)
+    for a in range(3) for b in range(3)
+)
+BEATS = (PAPER, SCISSORS, ROCK)
+
+BATCH_SIZE = 4096
+
+
+def resolve(move_a, move_b):
+    return RESULTS[move_a * 3 + move_b]
+
+
+class Strategy:
+    name = "strategy"
+    stateless = False
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def next_move(self):
+        raise NotImplementedError
+
+    def observe(self, own_move, opponent_move):
+        pass
+
+    def moves(self, count):
+        return [self.next_move() for _ in range(count)]
+
+
+class UniformRandom(Strategy):
+    name = "uniform"
+    stateless = True
+
+    def next_move(self):
+        return self.rng.randrange(3)
+
+    def moves(self, count):
+        return self.rng.choices(range(3), k=count)
+
+
+class Constant(Strategy):
+    name = "constant"
+    stateless = True
+
+    def __init__(self, move=ROCK, rng=None):
+        super().__init__(rng)
+        self.move = move
+
+    def next_move(self):
+        return self.move
+
+    def moves(self, count):
+        return [self.move] * count
+
+
+class Biased(Strategy):
+    name = "biased"
+    stateless = True
+
+    def __init__(self, weights=(0.5, 0.3, 0.2), rng=None):
+        super().__init__(rng)
+        self.weights = weights
+
+    def next_move(self):
+        return self.rng.choices(range(3), self.weights)[0]
+
+    def moves(self, count):
+        return self.rng.choices(range(3), self.weights, k=count)
+
+
+class Cycle(Strategy):
+    name = "cycle"
+
+    def __init__(self, sequence=(ROCK, PAPER, SCISSORS), rng=None):
+        super().__init__(rng)
+        self.sequence = sequence
+        self.position = 0
+
+    def next_move(self):
+        move = self.sequence[self.position]
+        self.position = (self.position + 1) % len(self.sequence)
+        return move
+
+
+class CopyOpponent(Strategy):
+    name = "copycat"
+
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        self.last = None
+
+    def next_move(self):
+        return self.rng.randrange(3) if self.last is None else self.last
+
+    def observe(self, own_move, opponent_move):
+        self.last = opponent_move
+
+
+class AdaptiveMarkov(Strategy):
+    name = "markov"
+
+    def __init__(self, order=2, window=300, rng=None):
+        super().__init__(rng)
+        self.order = order
+        self.window = window
+        self.contexts = 3 ** order
+        self.counts = [0] * (self.contexts * 3)
+        self.recent = deque()
+        self.context = 0
+        self.seen = 0
+
+    def next_move(self):
+        if self.seen < self.order:
+            return self.rng.randrange(3)
+        base = self.context * 3
+        counts = self.counts[base:base + 3]
+        best = max(counts)
+        if best == 0:
+            return self.rng.randrange(3)
+        predicted = [move for move in range(3) if counts[move] == best]
+        return BEATS[predicted[0] if len(predicted) == 1 else self.rng.choice(predicted)]
+
+    def observe(self, own_move, opponent_move):
+        if self.seen >= self.order:
+            index = self.context * 3 + opponent_move
+            self.counts[index] += 1
+            self.recent.append(index)
+            if len(self.recent) > self.window:
+                self.counts[self.recent.popleft()] -= 1
+        self.context = (self.context * 3 + opponent_move) % self.contexts
+        self.seen += 1
+
+
+class MatchResult:
+    def __init__(self, name_a, name_b, wins_a, wins_b, ties):
+        self.name_a = name_a
+        self.name_b = name_b
+        self.wins_a = wins_a
+        self.wins_b = wins_b
+        self.ties = ties
+
+    @property
+    def rounds(self):
+        return self.wins_a + self.wins_b + self.ties
+
+    def win_rate(self, side='a'):
+        wins = self.wins_a if side == 'a' else self.wins_b
+        return wins / self.rounds if self.rounds else 0.0
+
+    def __repr__(self):
+        return (f"MatchResult({self.name_a} {self.wins_a} - {self.wins_b} {self.name_b}, "
+                f"ties={self.ties})")
+
+
+def simulate(strategy_a, strategy_b, rounds, batch_size=BATCH_SIZE):
+    tally = [0, 0, 0]
+    if strategy_a.stateless and strategy_b.stateless:
+        remaining = rounds
+        while remaining:
+            count = min(batch_size, remaining)
+            pairs = Counter(map(int.__add__, map((3).__mul__, strategy_a.moves(count)), strategy_b.moves(count)))
+            for pair, times in pairs.items():
+                tally[RESULTS[pair]] += times
+            remaining -= count
+    else:
+        next_a, next_b = strategy_a.next_move, strategy_b.next_move
+        observe_a, observe_b = strategy_a.observe, strategy_b.observe
+        for _ in range(rounds):
+            a = next_a()
+            b = next_b()
+            tally[RESULTS[a * 3 + b]] += 1
+            observe_a(a, b)
+            observe_b(b, a)
+    return MatchResult(strategy_a.name, strategy_b.name, tally[1], tally[2], tally[0])
+
+
+STRATEGIES = {
+    cls.name: cls for cls in (UniformRandom, Constant, Biased, Cycle, CopyOpponent, AdaptiveMarkov)
+}
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate Rock Paper Scissors matches")
+    parser.add_argument("strategy_a", choices=sorted(STRATEGIES))
+    parser.add_argument("strategy_b", choices=sorted(STRATEGIES))
+    parser.add_argument("--rounds", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    a = STRATEGIES[args.strategy_a](rng=random.Random(rng.random()))
+    b = STRATEGIES[args.strategy_b](rng=random.Random(rng.random()))
+    result = simulate(a, b, args.rounds)
+    print(f"{result.rounds} rounds")
+    print(f"{a.name:>10}: {result.wins_a:>10} wins ({result.win_rate('a'):.2%})")
+    print(f"{b.name:>10}: {result.wins_b:>10} wins ({result.win_rate('b'):.2%})")
+    print(f"{'ties':>10}: {result.ties:>10}")
@@ -0,0 +1,143 @@
+import argparse
+import importlib
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+from engine import STRATEGIES, simulate
+
+Z_95 = 1.96
+
+
+def load_strategy(spec):
+    if spec in STRATEGIES:
+        return STRATEGIES[spec]
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown strategy {spec!r}; use a built-in name or module:Class")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def pairing_seed(base_seed, spec_a, spec_b):
+    return random.Random(f"{base_seed}:{spec_a}:{spec_b}").getrandbits(64)
+
+
+def play_pairing(spec_a, spec_b, rounds, seed):
+    a = load_strategy(spec_a)(rng=random.Random(seed))
+    b = load_strategy(spec_b)(rng=random.Random(seed + 1))
+    result = simulate(a, b, rounds)
+    return {
+        "a": spec_a,
+        "b": spec_b,
+        "seed": seed,
+        "rounds": rounds,
+        "wins_a": result.wins_a,
+        "wins_b": result.wins_b,
+        "ties": result.ties,
+    }
+
+
+def load_checkpoint(path):
+    results = {}
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            for line in f:
+                # A line torn by a crash is skipped; the next run appends after it.
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                results[(record["a"], record["b"])] = record
+    return results
+
+
+def _open_log(path):
+    log = open(path, 'a')
+    if log.tell():
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                log.write("\n")
+    return log
+
+
+def run_tournament(specs, rounds, workers=None, seed=0, checkpoint=None):
+    if rounds < 1:
+        raise ValueError("A pairing needs at least one round")
+    for spec in specs:
+        load_strategy(spec)
+    results = load_checkpoint(checkpoint)
+    pending = [
+        (a, b) for a, b in combinations(specs, 2)
+        if (a, b) not in results
+        or (results[(a, b)]["rounds"], results[(a, b)]["seed"]) != (rounds, pairing_seed(seed, a, b))
+    ]
+
+    log = _open_log(checkpoint) if checkpoint else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(play_pairing, a, b, rounds, pairing_seed(seed, a, b))
+                for a, b in pending
+            ]
+            for future in as_completed(futures):
+                record = future.result()
+                results[(record["a"], record["b"])] = record
+                if log:
+                    log.write(json.dumps(record) + "\n")
+                    log.flush()
+    finally:
+        if log:
+            log.close()
+    return [results[pair] for pair in combinations(specs, 2)]
+
+
+def leaderboard(records):
+    totals = {}
+    for record in records:
+        for side, other in (("a", "b"), ("b", "a")):
+            entry = totals.setdefault(record[side], {"wins": 0, "losses": 0, "ties": 0})
+            entry["wins"] += record[f"wins_{side}"]
+            entry["losses"] += record[f"wins_{other}"]
+            entry["ties"] += record["ties"]
+
+    rows = []
+    for name, entry in totals.items():
+        rounds = entry["wins"] + entry["losses"] + entry["ties"]
+        score = (entry["wins"] + 0.5 * entry["ties"]) / rounds
+        variance = (entry["wins"] + 0.25 * entry["ties"]) / rounds - score ** 2
+        margin = Z_95 * math.sqrt(max(variance, 0.0) / rounds)
+        rows.append({"strategy": name, "rounds": rounds, "score": score, "margin": margin, **entry})
+    rows.sort(key=lambda row: row["score"], reverse=True)
+    return rows
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin Rock Paper Scissors tournament")
+    parser.add_argument("strategies", nargs="*", default=sorted(STRATEGIES),
+                        help="built-in strategy names or module:Class specs")
+    parser.add_argument("--rounds", type=positive_int, default=1_000_000, help="rounds per pairing")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint", help="JSON-lines file to record and resume pairings")
+    args = parser.parse_args()
+
+    records = run_tournament(args.strategies, args.rounds, args.workers, args.seed, args.checkpoint)
+    print(f"\n{'#':>2}  {'strategy':<12} {'score':>8} {'95% CI':>10} {'wins':>10} {'losses':>10} {'ties':>10}")
+    for rank, row in enumerate(leaderboard(records), 1):
+        print(f"{rank:>2}  {row['strategy']:<12} {row['score']:>8.4f} {'±' + format(row['margin'], '.4f'):>10} "
+              f"{row['wins']:>10} {row['losses']:>10} {row['ties']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,190 @@
 import os
 import re
+import time
 from datetime import datetime
 
+from contact_search import SearchIndex
+
+PHONE_RE = re.compile(r'^\+?1?\d{9,15}$')
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+def _epoch(value):
+    if value is None:
+        return int(time.time())
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
 class Contact:
-    def __init__(self, name, phone, email, address):
+    __slots__ = ('id', 'name', 'phone', 'email', 'address', 'created_ts', 'updated_ts')
+    
+    def __init__(self, name, phone, email, address, created_at=None, updated_at=None, id=None):
+        self.id = id
         self.name = name
         self.phone = phone
         self.email = email
         self.address = address
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self.created_ts = _epoch(created_at)
+        self.updated_ts = _epoch(updated_at)
+    
+    @property
+    def created_at(self):
+        return datetime.fromtimestamp(self.created_ts)
+    
+    @created_at.setter
+    def created_at(self, value):
+        self.created_ts = _epoch(value)
+    
+    @property
+    def updated_at(self):
+        return datetime.fromtimestamp(self.updated_ts)
+    
+    @updated_at.setter
+    def updated_at(self, value):
+        self.updated_ts = _epoch(value)
+
+class ContactNotFoundError(ValueError):
+    pass
 
 class ContactManager:
-    def __init__(self):
-        self.contacts = []
+    def __init__(self, store=None):
+        self.store = store
+        self._by_id = None
+        self._phones = {}
+        self._index = SearchIndex()
+        self._sorted = None
+        self._next_id = 1
     
-    def add_contact(self, name, phone, email, address):
+    @property
+    def contacts(self):
+        if self._sorted is None:
+            self._loaded()
+            self._sorted = list(self._index.by_name())
+        return self._sorted
+    
+    def _loaded(self):
+        if self._by_id is None:
+            self._load()
+        return self._by_id
+    
+    def _load(self):
+        self._by_id = {}
+        if self.store is not None:
+            for id, name, phone, email, address, created_at, updated_at in self.store.load_all():
+                self._by_id[id] = Contact(name, phone, email, address, created_at, updated_at, id)
+        self._phones = {contact.phone: contact for contact in self._by_id.values()}
+        self._index = SearchIndex(self._by_id.values())
+        self._sorted = None
+    
+    def _validate(self, phone, email):
         if not self._is_valid_phone(phone):
             raise ValueError("Invalid phone number format")
         if not self._is_valid_email(email):
             raise ValueError("Invalid email format")
+    
+    def _assign_ids(self, contacts):
+        # Only for a manager without a store; a store assigns ids inside its
+        # insert, so managers sharing one database never hand out the same id.
+        for contact in contacts:
+            contact.id = self._next_id
+            self._next_id += 1
+    
+    def get_contact(self, contact_id):
+        contact = self._loaded().get(contact_id)
+        if contact is None:
+            raise ContactNotFoundError("Contact not found")
+        return contact
+    
+    def add_contact(self, name, phone, email, address):
+        self._loaded()
+        self._validate(phone, email)
         if self._phone_exists(phone):
             raise ValueError("Phone number already exists")
             
         contact = Contact(name, phone, email, address)
-        self.contacts.append(contact)
-        self._sort_contacts()
+        if self.store is not None:
+            self.store.insert(contact)
+        else:
+            self._assign_ids([contact])
+        self._by_id[contact.id] = contact
+        self._phones[phone] = contact
+        self._index.add(contact)
+        self._sorted = None
         return contact
     
-    def update_contact(self, index, name, phone, email, address):
-        if not self._is_valid_phone(phone):
-            raise ValueError("Invalid phone number format")
-        if not self._is_valid_email(email):
-            raise ValueError("Invalid email format")
-        if phone != self.contacts[index].phone and self._phone_exists(phone):
+    def import_contacts(self, rows):
+        self._loaded()
+        added = []
+        phones = {}
+        errors = []
+        now = int(time.time())
+        for line, (name, phone, email, address) in enumerate(rows, 1):
+            try:
+                if not name:
+                    raise ValueError("Name cannot be empty")
+                self._validate(phone, email)
+                if phone in phones or self._phone_exists(phone):
+                    raise ValueError("Phone number already exists")
+            except ValueError as e:
+                errors.append((line, str(e)))
+                continue
+            contact = Contact(name, phone, email, address, now, now)
+            phones[phone] = contact
+            added.append(contact)
+        
+        if self.store is not None:
+            self.store.insert_many(added)
+        else:
+            self._assign_ids(added)
+        self._phones.update(phones)
+        self._by_id.update((contact.id, contact) for contact in added)
+        self._index.add_many(added)
+        self._sorted = None
+        return added, errors
+    
+    def update_contact(self, contact_id, name, phone, email, address):
+        contact = self.get_contact(contact_id)
+        self._validate(phone, email)
+        if phone != contact.phone and self._phone_exists(phone):
             raise ValueError("Phone number already exists")
             
-        contact = self.contacts[index]
+        del self._phones[contact.phone]
+        self._index.remove(contact)
         contact.name = name
         contact.phone = phone
         contact.email = email
         contact.address = address
-        contact.updated_at = datetime.now()
-        self._sort_contacts()
+        contact.updated_ts = int(time.time())
+        self._phones[phone] = contact
+        self._index.add(contact)
+        self._sorted = None
+        if self.store is not None:
+            self.store.update(contact)
+        return contact
         
-    def delete_contact(self, index):
-        return self.contacts.pop(index)
-    
-    def search_contacts(self, query):
-        query = query.lower()
-        return [
-            (i, contact) for i, contact in enumerate(self.contacts)
-            if query in contact.name.lower() or query in contact.phone
-        ]
+    def delete_contact(self, contact_id):
+        contact = self.get_contact(contact_id)
+        del self._by_id[contact_id]
+        del self._phones[contact.phone]
+        self._index.remove(contact)
+        self._sorted = None
+        if self.store is not None:
+            self.store.delete(contact.id)
+        return contact
     
-    def _sort_contacts(self):
-        self.contacts.sort(key=lambda x: x.name.lower())
+    def search_contacts(self, query, limit=50):
+        self._loaded()
+        return [(contact.id, contact) for contact in self._index.search(query, limit)]
     
     def _is_valid_phone(self, phone):
-        return bool(re.match(r'^\+?1?\d{9,15}$', phone))
+        return PHONE_RE.match(phone) is not None
     
     def _is_valid_email(self, email):
-        return bool(re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email))
+        return EMAIL_RE.match(email) is not None
     
     def _phone_exists(self, phone):
-        return any(contact.phone == phone for contact in self.contacts)
+        self._loaded()
+        return phone in self._phones
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -76,7 +196,9 @@ def display_menu():
     print("3. Search Contacts")
     print("4. Update Contact")
     print("5. Delete Contact")
-    print("6. Exit")
+    print("6. Import Contacts (CSV/vCard)")
+    print("7. Export Contacts (CSV/vCard)")
+    print("8. Exit")
 
 def display_contact(contact):
     print(f"\nName: {contact.name}")
@@ -99,13 +221,15 @@ def get_contact_details(existing_contact=None):
     return name, phone, email, address
 
 def main():
-    manager = ContactManager()
+    import contact_io
+    from contact_store import SqliteContactStore
+    manager = ContactManager(SqliteContactStore("contacts.db"))
     
     while True:
         clear_screen()
         display_menu()
         
-        choice = input("\nEnter your choice (1-6): ")
+        choice = input("\nEnter your choice (1-8): ")
         
         try:
             if choice == '1':
@@ -131,8 +255,8 @@ def main():
                     print("\nNo matching contacts found!")
                 else:
                     print(f"\nFound {len(results)} matching contacts:")
-                    for i, contact in results:
-                        print(f"\n{i + 1}. {contact.name}")
+                    for i, (_, contact) in enumerate(results, 1):
+                        print(f"\n{i}. {contact.name}")
                         print(f"   📞 {contact.phone}")
                     
                     view_details = input("\nEnter contact number to view details (or press Enter to skip): ")
@@ -144,16 +268,18 @@ def main():
                     print("\nNo contacts to update!")
                     continue
                     
+                contacts = manager.contacts
                 print("\n=== Select Contact to Update ===")
-                for i, contact in enumerate(manager.contacts, 1):
+                for i, contact in enumerate(contacts, 1):
                     print(f"{i}. {contact.name} ({contact.phone})")
                 
                 index = int(input("\nEnter contact number: ")) - 1
-                if 0 <= index < len(manager.contacts):
+                if 0 <= index < len(contacts):
+                    contact = contacts[index]
                     print("\nCurrent details:")
-                    display_contact(manager.contacts[index])
-                    details = get_contact_details(manager.contacts[index])
-                    manager.update_contact(index, *details)
+                    display_contact(contact)
+                    details = get_contact_details(contact)
+                    manager.update_contact(contact.id, *details)
                     print("\n✅ Contact updated successfully!")
                 else:
                     print("\n❌ Invalid contact number!")
@@ -163,18 +289,31 @@ def main():
                     print("\nNo contacts to delete!")
                     continue
                     
+                contacts = manager.contacts
                 print("\n=== Select Contact to Delete ===")
-                for i, contact in enumerate(manager.contacts, 1):
+                for i, contact in enumerate(contacts, 1):
                     print(f"{i}. {contact.name} ({contact.phone})")
                 
                 index = int(input("\nEnter contact number: ")) - 1
-                if 0 <= index < len(manager.contacts):
-                    contact = manager.delete_contact(index)
+                if 0 <= index < len(contacts):
+                    contact = manager.delete_contact(contacts[index].id)
                     print(f"\n✅ Contact '{contact.name}' deleted successfully!")
                 else:
                     print("\n❌ Invalid contact number!")
                 
             elif choice == '6':
+                path = input("\nFile to import (.csv or .vcf): ").strip()
+                added, failed, errors_path = contact_io.import_file(manager, path)
+                print(f"\n✅ Imported {added} contacts!")
+                if failed:
+                    print(f"❌ {failed} rows rejected, details in {errors_path}")
+                
+            elif choice == '7':
+                path = input("\nFile to export to (.csv or .vcf): ").strip()
+                count = contact_io.export_file(manager, path)
+                print(f"\n✅ Exported {count} contacts to {path}!")
+                
+            elif choice == '8':
                 print("\nThank you for using Contact Management System!")
                 break
                 
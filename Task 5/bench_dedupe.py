@@ -0,0 +1,45 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bench_search import FIRST, LAST
+from dedupe import validate_and_dedupe
+
+ROWS = 10_000_000
+
+
+def make_rows(count, seed=42):
+    rng = random.Random(seed)
+    for i in range(count):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)}{rng.randrange(100000)}"
+        phone = f"+1555{i:07d}"
+        email = f"user{i}@example.com"
+        roll = rng.random()
+        if roll < 0.01:
+            phone = "12-34"
+        elif roll < 0.02:
+            email = "not-an-email"
+        elif roll < 0.04 and i:
+            phone = f"1555{rng.randrange(i):07d}"
+        elif roll < 0.05:
+            name = name[:-1] + "x"
+        yield i + 1, (name, phone, email, "")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    cpus = os.cpu_count() or 1
+    print(f"{count} rows, {cpus} CPUs")
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, "report.csv")
+        for workers in sorted({1, 2, 4, cpus}):
+            start = time.perf_counter()
+            summary = validate_and_dedupe(make_rows(count), report, workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>3} workers  {elapsed:8.2f} s  {count / elapsed:10,.0f} rows/s  {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from Task5 import Contact
+
+CONTACTS = 1_000_000
+
+
+class LegacyContact:
+    def __init__(self, name, phone, email, address, created_at=None, updated_at=None, id=None):
+        self.id = id
+        self.name = name
+        self.phone = phone
+        self.email = email
+        self.address = address
+        self.created_at = created_at or datetime.now()
+        self.updated_at = updated_at or datetime.now()
+
+
+def measure(cls, rows, stamp):
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [cls(name, phone, email, address, stamp(), stamp(), i)
+               for i, (name, phone, email, address) in enumerate(rows)]
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else CONTACTS
+    rows = [(f"Contact {i}", f"+1555{i:07d}", f"user{i}@example.com", f"{i} Main St")
+            for i in range(count)]
+    now = time.time()
+
+    print(f"{count} contacts (strings excluded, they are shared by both layouts)\n")
+    print(f"{'layout':<26} {'bytes/contact':>14} {'total MB':>10} {'build s':>8}")
+    for label, cls, stamp in (
+        ("dict + datetime", LegacyContact, lambda: datetime.fromtimestamp(now)),
+        ("__slots__ + epoch ints", Contact, lambda: int(now)),
+    ):
+        size, elapsed = measure(cls, rows, stamp)
+        print(f"{label:<26} {size / count:>14.1f} {size / 1e6:>10.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
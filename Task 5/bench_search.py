@@ -0,0 +1,49 @@
+import random
+import sys
+import time
+
+from Task5 import ContactManager
+
+CONTACTS = 1_000_000
+QUERIES = ["ann", "smith", "jo", "maria gar", "555", "+1 555 01", "zzz", "lee"]
+FIRST = ["Ann", "John", "Maria", "Wei", "Aisha", "Carlos", "Priya", "Olga", "James", "Fatima",
+         "Liam", "Noah", "Emma", "Sofia", "Yuki", "Omar", "Lucas", "Mia", "Ivan", "Zara"]
+LAST = ["Smith", "Garcia", "Lee", "Khan", "Novak", "Silva", "Patel", "Kim", "Brown", "Rossi",
+        "Müller", "Cohen", "Nguyen", "Okafor", "Larsen", "Dubois", "Tanaka", "Ali", "Jones", "Moreau"]
+
+
+def make_contacts(count, rng):
+    for i in range(count):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)}{rng.randrange(10000)}"
+        yield name, f"+1555{i:07d}", f"user{i}@example.com", ""
+
+
+def scan(manager, query):
+    query = query.lower()
+    return [
+        (i, contact) for i, contact in enumerate(manager.contacts)
+        if query in contact.name.lower() or query in contact.phone
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else CONTACTS
+    rng = random.Random(42)
+    manager = ContactManager()
+    start = time.perf_counter()
+    manager.import_contacts(make_contacts(count, rng))
+    print(f"{count} contacts indexed in {time.perf_counter() - start:.1f} s\n")
+
+    print(f"{'query':<12} {'scan ms':>10} {'index ms':>10} {'results':>8}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        scan(manager, query)
+        scan_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        results = manager.search_contacts(query)
+        index_ms = (time.perf_counter() - start) * 1000
+        print(f"{query:<12} {scan_ms:>10.2f} {index_ms:>10.3f} {len(results):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import csv
+import os
+import re
+import sys
+from itertools import islice
+
+FIELDS = ("name", "phone", "email", "address")
+EXPORT_FIELDS = FIELDS + ("created_at", "updated_at")
+BATCH_SIZE = 10000
+VCARD_EXTENSIONS = (".vcf", ".vcard")
+COMPONENT_SEPARATOR = re.compile(r"(?<!\\);")
+
+
+def detect_format(path):
+    return "vcard" if path.lower().endswith(VCARD_EXTENSIONS) else "csv"
+
+
+def read_csv(f):
+    reader = csv.DictReader(f)
+    missing = [field for field in FIELDS if field not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+    for row in reader:
+        yield reader.line_num, tuple((row[field] or "").strip() for field in FIELDS)
+
+
+def _unfold(f):
+    # vCard continuation lines start with a space or tab.
+    pending = None
+    start = 0
+    for lineno, line in enumerate(f, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield start, pending
+        pending, start = line, lineno
+    if pending is not None:
+        yield start, pending
+
+
+def _unescape(value):
+    return (value.replace("\\n", "\n").replace("\\N", "\n")
+            .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def _escape(value):
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def read_vcard(f):
+    card = None
+    start = 0
+    for lineno, line in _unfold(f):
+        key, _, value = line.partition(":")
+        prop = key.split(";", 1)[0].upper()
+        if prop == "BEGIN" and value.upper() == "VCARD":
+            card, start = {}, lineno
+        elif card is None:
+            continue
+        elif prop == "END":
+            yield start, tuple(card.get(field, "") for field in FIELDS)
+            card = None
+        elif prop == "FN":
+            card["name"] = _unescape(value).strip()
+        elif prop == "TEL":
+            card.setdefault("phone", value.strip())
+        elif prop == "EMAIL":
+            card.setdefault("email", value.strip())
+        elif prop == "ADR":
+            parts = (_unescape(part).strip() for part in COMPONENT_SEPARATOR.split(value))
+            card.setdefault("address", ", ".join(part for part in parts if part))
+
+
+READERS = {"csv": read_csv, "vcard": read_vcard}
+
+
+def import_file(manager, path, fmt=None, errors_path=None, batch_size=BATCH_SIZE):
+    fmt = fmt or detect_format(path)
+    errors_path = errors_path or path + ".errors.csv"
+    added = failed = 0
+    with open(path, "r", encoding="utf-8", newline="") as f, \
+            open(errors_path, "w", encoding="utf-8", newline="") as errors_file:
+        errors = csv.writer(errors_file)
+        errors.writerow(("line", "error") + FIELDS)
+        rows = READERS[fmt](f)
+        for batch in iter(lambda: list(islice(rows, batch_size)), []):
+            contacts, batch_errors = manager.import_contacts(row for _, row in batch)
+            added += len(contacts)
+            for position, message in batch_errors:
+                lineno, row = batch[position - 1]
+                errors.writerow((lineno, message) + row)
+            failed += len(batch_errors)
+    if not failed:
+        os.remove(errors_path)
+    return added, failed, errors_path if failed else None
+
+
+def export_csv(contacts, f):
+    writer = csv.writer(f)
+    writer.writerow(EXPORT_FIELDS)
+    for contact in contacts:
+        writer.writerow((
+            contact.name, contact.phone, contact.email, contact.address,
+            contact.created_at.isoformat(), contact.updated_at.isoformat()
+        ))
+
+
+def export_vcard(contacts, f):
+    for contact in contacts:
+        f.write(
+            "BEGIN:VCARD\r\nVERSION:3.0\r\n"
+            f"N:{_escape(contact.name)};;;;\r\n"
+            f"FN:{_escape(contact.name)}\r\n"
+            f"TEL:{contact.phone}\r\n"
+            f"EMAIL:{contact.email}\r\n"
+            f"ADR:;;{_escape(contact.address)};;;;\r\n"
+            f"REV:{contact.updated_at.strftime('%Y%m%dT%H%M%S')}\r\n"
+            "END:VCARD\r\n"
+        )
+
+
+WRITERS = {"csv": export_csv, "vcard": export_vcard}
+
+
+def export_file(manager, path, fmt=None):
+    fmt = fmt or detect_format(path)
+    contacts = manager.contacts
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        WRITERS[fmt](contacts, f)
+    return len(contacts)
+
+
+def main(argv):
+    from contact_store import SqliteContactStore
+    from Task5 import ContactManager
+
+    if len(argv) not in (2, 3) or argv[0] not in ("import", "export"):
+        print("usage: contact_io.py import|export FILE [DATABASE]")
+        return 2
+    manager = ContactManager(SqliteContactStore(argv[2] if len(argv) > 2 else "contacts.db"))
+    try:
+        if argv[0] == "import":
+            added, failed, errors_path = import_file(manager, argv[1])
+            print(f"Imported {added} contacts")
+            if failed:
+                print(f"{failed} rows rejected, see {errors_path}")
+        else:
+            print(f"Exported {export_file(manager, argv[1])} contacts to {argv[1]}")
+    finally:
+        manager.store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
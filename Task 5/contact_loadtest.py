@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import quote
+
+QUERIES = ["ann", "smith", "jo", "maria", "lee", "555", "garcia", "wei", "kim", "ol", "+1 555 01", "zzz"]
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def raise_fd_limit(needed):
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def open_connection(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def request(reader, writer, method, path, body=b""):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client(args, connection, rng, start, deadline, latencies, counts):
+    reader, writer = connection
+    await start.wait()
+    try:
+        while time.perf_counter() < deadline[0]:
+            if rng.random() < args.write_ratio:
+                phone = f"+1777{rng.randrange(10 ** 7):07d}"
+                body = json.dumps({"name": "Load Test", "phone": phone,
+                                   "email": "load@example.com", "address": ""}).encode()
+                method, path = "POST", "/contacts"
+            else:
+                body = b""
+                method, path = "GET", f"/search?q={quote(rng.choice(QUERIES))}&limit={args.limit}"
+            sent = time.perf_counter()
+            status = await request(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - sent)
+            if status >= 500 or (status >= 400 and method == "GET"):
+                counts["errors"] += 1
+    except (OSError, asyncio.IncompleteReadError):
+        counts["errors"] += 1
+    finally:
+        writer.close()
+
+
+async def run(args):
+    raise_fd_limit(args.connections + 64)
+    rng = random.Random(args.seed)
+    connections = await asyncio.gather(
+        *(open_connection(args) for _ in range(args.connections)), return_exceptions=True
+    )
+    opened = [c for c in connections if not isinstance(c, BaseException)]
+    counts = {"errors": 0, "connect_errors": len(connections) - len(opened)}
+    latencies = []
+    start = asyncio.Event()
+    deadline = [0.0]
+    clients = [
+        asyncio.create_task(client(args, connection, random.Random(rng.random()), start, deadline, latencies, counts))
+        for connection in opened
+    ]
+    began = time.perf_counter()
+    deadline[0] = began + args.duration
+    start.set()
+    await asyncio.gather(*clients)
+    return latencies, counts, time.perf_counter() - began, len(opened)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test contact_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="fraction of requests that add a contact")
+    parser.add_argument("--limit", type=int, default=20, help="search result limit")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    latencies, counts, elapsed, opened = asyncio.run(run(args))
+    latencies.sort()
+    print(f"{opened} connections, {len(latencies)} requests in {elapsed:.1f} s")
+    print(f"{len(latencies) / elapsed:,.0f} requests/s")
+    print(f"p50 {percentile(latencies, 0.50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms   "
+          f"max {(latencies[-1] if latencies else 0) * 1000:.2f} ms")
+    print(f"errors {counts['errors']}, failed connections {counts['connect_errors']}")
+
+
+if __name__ == "__main__":
+    main()
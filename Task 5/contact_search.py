@@ -0,0 +1,208 @@
+import bisect
+import re
+
+NON_DIGITS = re.compile(r'\D')
+PHONE_QUERY = re.compile(r'^[\d\s+().-]+$')
+EMPTY = frozenset()
+
+
+def normalize_phone(phone):
+    digits = NON_DIGITS.sub('', phone)
+    if len(digits) == 11 and digits.startswith('1') or phone.lstrip().startswith('+1'):
+        digits = digits[1:]
+    return digits
+
+
+def phone_forms(phone):
+    # Digits as written and without the country code, so "1555" finds
+    # +1 555 123 4567 and "123" finds a stored 12345678901.
+    return {NON_DIGITS.sub('', phone), normalize_phone(phone)} - {''}
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def matches(query, name, phone):
+    # True if a contact with this name and phone could appear in search(query).
+    text = query.strip().lower()
+    if not text:
+        return False
+    if text in name.lower():
+        return True
+    if PHONE_QUERY.match(text):
+        stored = phone_forms(phone)
+        return any(digits in form for digits in phone_forms(text) for form in stored)
+    return False
+
+
+class SortedKeys:
+    # Sorted (key, id, contact) entries kept in bounded chunks, so an insert
+    # or removal only shifts one chunk instead of the whole list.
+    LOAD = 1000
+
+    def __init__(self):
+        self._chunks = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def update(self, entries):
+        entries = sorted([*self, *entries])
+        self._chunks = [entries[i:i + self.LOAD] for i in range(0, len(entries), self.LOAD)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(entries)
+
+    def add(self, entry):
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([entry])
+            self._maxes.append(entry)
+            return
+        i = bisect.bisect_left(self._maxes, entry)
+        if i == len(self._maxes):
+            i -= 1
+            self._chunks[i].append(entry)
+            self._maxes[i] = entry
+        else:
+            bisect.insort(self._chunks[i], entry)
+        chunk = self._chunks[i]
+        if len(chunk) > 2 * self.LOAD:
+            self._chunks[i:i + 1] = [chunk[:self.LOAD], chunk[self.LOAD:]]
+            self._maxes[i:i + 1] = [chunk[self.LOAD - 1], chunk[-1]]
+
+    def remove(self, key):
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return
+        chunk = self._chunks[i]
+        j = bisect.bisect_left(chunk, key)
+        if j == len(chunk) or chunk[j][:2] != key:
+            return
+        del chunk[j]
+        self._len -= 1
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+
+    def starting_with(self, prefix):
+        key = (prefix,)
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return
+        j = bisect.bisect_left(self._chunks[i], key)
+        for chunk in self._chunks[i:]:
+            for entry in chunk[j:]:
+                if not entry[0].startswith(prefix):
+                    return
+                yield entry[2]
+            j = 0
+
+
+class SearchIndex:
+    def __init__(self, contacts=()):
+        self.names = {}
+        self.phones = {}
+        self.name_keys = SortedKeys()
+        self.phone_keys = SortedKeys()
+        self.add_many(contacts)
+
+    def add(self, contact):
+        name = contact.name.lower()
+        phones = phone_forms(contact.phone)
+        for gram in trigrams(name):
+            self.names.setdefault(gram, set()).add(contact)
+        for gram in set().union(*map(trigrams, phones)):
+            self.phones.setdefault(gram, set()).add(contact)
+        self.name_keys.add((name, contact.id, contact))
+        for phone in phones:
+            self.phone_keys.add((phone, contact.id, contact))
+
+    def add_many(self, contacts):
+        contacts = list(contacts)
+        phone_entries = []
+        for contact in contacts:
+            name = contact.name.lower()
+            phones = phone_forms(contact.phone)
+            for gram in trigrams(name):
+                self.names.setdefault(gram, set()).add(contact)
+            for gram in set().union(*map(trigrams, phones)):
+                self.phones.setdefault(gram, set()).add(contact)
+            phone_entries.extend((phone, contact.id, contact) for phone in phones)
+        self.name_keys.update((c.name.lower(), c.id, c) for c in contacts)
+        self.phone_keys.update(phone_entries)
+
+    def remove(self, contact):
+        name = contact.name.lower()
+        phones = phone_forms(contact.phone)
+        for gram in trigrams(name):
+            self._discard(self.names, gram, contact)
+        for gram in set().union(*map(trigrams, phones)):
+            self._discard(self.phones, gram, contact)
+        self.name_keys.remove((name, contact.id))
+        for phone in phones:
+            self.phone_keys.remove((phone, contact.id))
+
+    def by_name(self):
+        return (entry[2] for entry in self.name_keys)
+
+    def search(self, query, limit=50):
+        text = query.strip().lower()
+        if not text:
+            return []
+        phones = phone_forms(text) if PHONE_QUERY.match(text) else ()
+
+        # Every pass stops once limit contacts are ranked. Prefix passes walk keys in
+        # sorted order, so they return the first matches by name or phone; the
+        # substring passes return the first matches they find.
+        ranks = {}
+        self._fill(ranks, self.name_keys.starting_with(text), 0, limit)
+        for phone in phones:
+            self._fill(ranks, self.phone_keys.starting_with(phone), 1, limit)
+        if len(text) >= 3:
+            found = self._matching(self.names, text)
+            self._fill(ranks, (c for c in found if text in c.name.lower()), 2, limit)
+        for phone in phones:
+            if len(phone) >= 3:
+                found = self._matching(self.phones, phone)
+                self._fill(ranks, (c for c in found
+                                   if any(phone in form for form in phone_forms(c.phone))), 3, limit)
+
+        return sorted(ranks, key=lambda contact: (ranks[contact], contact.name.lower(), contact.id))
+
+    @staticmethod
+    def _discard(index, gram, contact):
+        bucket = index.get(gram)
+        if bucket is not None:
+            bucket.discard(contact)
+            if not bucket:
+                del index[gram]
+
+    @staticmethod
+    def _fill(ranks, contacts, rank, limit):
+        if len(ranks) >= limit:
+            return
+        for contact in contacts:
+            ranks.setdefault(contact, rank)
+            if len(ranks) >= limit:
+                return
+
+    @staticmethod
+    def _matching(index, text):
+        # Walk the smallest posting set and probe the others, so a caller that
+        # stops early never pays for the full intersection.
+        buckets = sorted((index.get(gram, EMPTY) for gram in trigrams(text)), key=len)
+        if not buckets:
+            return
+        rest = buckets[1:]
+        for contact in buckets[0]:
+            if all(contact in bucket for bucket in rest):
+                yield contact
@@ -0,0 +1,91 @@
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL,
+    address TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_name ON contacts (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+COLUMNS = "id, name, phone, email, address, created_at, updated_at"
+
+
+class SqliteContactStore:
+    def __init__(self, filename="contacts.db"):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def load_all(self):
+        return self.conn.execute(
+            f"SELECT {COLUMNS} FROM contacts ORDER BY name COLLATE NOCASE"
+        )
+
+    def next_id(self):
+        # The persisted counter keeps ids of deleted contacts from being handed out again.
+        return self.conn.execute(
+            "SELECT MAX(COALESCE((SELECT value FROM counters WHERE name = 'contacts'), 1), "
+            "COALESCE((SELECT MAX(id) FROM contacts), 0) + 1)"
+        ).fetchone()[0]
+
+    def insert(self, contact):
+        self.insert_many([contact])
+
+    def insert_many(self, contacts):
+        contacts = list(contacts)
+        if not contacts:
+            return
+        new = [contact for contact in contacts if contact.id is None]
+        try:
+            with self.conn:
+                # Taking the write lock before reading the counter keeps two
+                # connections to the same file from handing out the same ids.
+                self.conn.execute("BEGIN IMMEDIATE")
+                next_id = self.next_id()
+                for contact in new:
+                    contact.id = next_id
+                    next_id += 1
+                next_id = max(next_id, max(contact.id for contact in contacts) + 1)
+                self.conn.executemany(
+                    f"INSERT INTO contacts ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self._row(contact) for contact in contacts)
+                )
+                self.conn.execute("INSERT OR REPLACE INTO counters VALUES ('contacts', ?)", (next_id,))
+        except BaseException:
+            for contact in new:
+                contact.id = None
+            raise
+
+    def update(self, contact):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE contacts SET name = ?, phone = ?, email = ?, address = ?, "
+                "created_at = ?, updated_at = ? WHERE id = ?",
+                self._row(contact)[1:] + (contact.id,)
+            )
+
+    def delete(self, contact_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+
+    def close(self):
+        self.conn.close()
+
+    def _row(self, contact):
+        return (
+            contact.id, contact.name, contact.phone, contact.email, contact.address,
+            contact.created_ts, contact.updated_ts
+        )
@@ -0,0 +1,184 @@
+import argparse
+import csv
+import os
+import pickle
+import re
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from contact_search import normalize_phone, trigrams
+from Task5 import EMAIL_RE, PHONE_RE
+
+CHUNK_SIZE = 50_000
+SHARDS = 64
+BLOCK_PREFIX = 3
+WINDOW = 4
+SIMILARITY = 0.6
+NAME_TOKENS = re.compile(r'[^\W_]+')
+
+
+def name_key(name):
+    return " ".join(sorted(NAME_TOKENS.findall(name.lower())))
+
+
+def shard_of(key, shards):
+    # crc32 rather than hash(): str hashes differ between worker processes.
+    return zlib.crc32(key.encode('utf-8')) % shards
+
+
+def _check_chunk(rows, shards):
+    invalid = []
+    phones = [[] for _ in range(shards)]
+    names = [[] for _ in range(shards)]
+    for lineno, (name, phone, email, _) in rows:
+        if not name:
+            invalid.append((lineno, "Name cannot be empty"))
+            continue
+        if PHONE_RE.match(phone) is None:
+            invalid.append((lineno, "Invalid phone number format"))
+            continue
+        if EMAIL_RE.match(email) is None:
+            invalid.append((lineno, "Invalid email format"))
+            continue
+        digits = normalize_phone(phone)
+        phones[shard_of(digits, shards)].append((digits, lineno))
+        key = name_key(name)
+        names[shard_of(key[:BLOCK_PREFIX], shards)].append((key, lineno))
+    return len(rows), invalid, phones, names
+
+
+def _fuzzy_clusters(block):
+    # Sorted-neighbourhood: only names within WINDOW of each other in sort order
+    # are compared, by Jaccard similarity of their trigram sets.
+    block.sort()
+    grams = [trigrams(f" {key} ") for key, _ in block]
+    parent = list(range(len(block)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, (key, _) in enumerate(block):
+        mine = grams[i]
+        for j in range(i + 1, min(i + 1 + WINDOW, len(block))):
+            if block[j][0] == key:
+                parent[find(j)] = find(i)
+                continue
+            theirs = grams[j]
+            shared = len(mine & theirs)
+            if shared >= SIMILARITY * (len(mine) + len(theirs) - shared):
+                parent[find(j)] = find(i)
+
+    groups = {}
+    for i, (key, lineno) in enumerate(block):
+        groups.setdefault(find(i), []).append((lineno, key))
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+def _dedupe_shard(path):
+    by_phone = {}
+    blocks = {}
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                phones, names = pickle.load(f)
+            except EOFError:
+                break
+            for digits, lineno in phones:
+                by_phone.setdefault(digits, []).append(lineno)
+            for key, lineno in names:
+                blocks.setdefault(key[:BLOCK_PREFIX], []).append((key, lineno))
+    os.remove(path)
+
+    phone_clusters = [(digits, sorted(lines)) for digits, lines in by_phone.items() if len(lines) > 1]
+    name_clusters = []
+    for block in blocks.values():
+        if len(block) > 1:
+            name_clusters.extend(_fuzzy_clusters(block))
+    return phone_clusters, name_clusters
+
+
+def _ordered_map(executor, fn, jobs, workers):
+    if executor is None:
+        for args in jobs:
+            yield fn(*args)
+        return
+    running = deque()
+    for args in jobs:
+        running.append(executor.submit(fn, *args))
+        if len(running) >= workers * 2:
+            yield running.popleft().result()
+    while running:
+        yield running.popleft().result()
+
+
+def validate_and_dedupe(rows, report_path, workers=None, chunk_size=CHUNK_SIZE, shards=SHARDS):
+    workers = workers or os.cpu_count() or 1
+    rows = iter(rows)
+    chunks = ((chunk, shards) for chunk in iter(lambda: list(islice(rows, chunk_size)), []))
+    summary = {"rows": 0, "invalid": 0, "phone_clusters": 0, "name_clusters": 0}
+
+    with tempfile.TemporaryDirectory() as spill, \
+            open(report_path, 'w', encoding='utf-8', newline='') as f:
+        report = csv.writer(f)
+        report.writerow(("kind", "key", "lines", "detail"))
+        paths = [os.path.join(spill, f"{shard}.shard") for shard in range(shards)]
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            spills = [open(path, 'wb') for path in paths]
+            try:
+                for count, invalid, phones, names in _ordered_map(executor, _check_chunk, chunks, workers):
+                    summary["rows"] += count
+                    summary["invalid"] += len(invalid)
+                    for lineno, message in invalid:
+                        report.writerow(("invalid", "", lineno, message))
+                    for spill_file, shard_phones, shard_names in zip(spills, phones, names):
+                        if shard_phones or shard_names:
+                            pickle.dump((shard_phones, shard_names), spill_file, pickle.HIGHEST_PROTOCOL)
+            finally:
+                for spill_file in spills:
+                    spill_file.close()
+
+            for phone_clusters, name_clusters in _ordered_map(
+                executor, _dedupe_shard, ((path,) for path in paths), workers
+            ):
+                summary["phone_clusters"] += len(phone_clusters)
+                summary["name_clusters"] += len(name_clusters)
+                for digits, lines in phone_clusters:
+                    report.writerow(("phone", digits, ";".join(map(str, lines)), ""))
+                for cluster in name_clusters:
+                    report.writerow((
+                        "name", cluster[0][1], ";".join(str(lineno) for lineno, _ in cluster),
+                        "; ".join(sorted({key for _, key in cluster}))
+                    ))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    return summary
+
+
+def main():
+    import contact_io
+
+    parser = argparse.ArgumentParser(description="Validate and find duplicates in a contact file")
+    parser.add_argument("path", help="CSV or vCard file")
+    parser.add_argument("--report", help="report CSV (default: <path>.report.csv)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    report_path = args.report or args.path + ".report.csv"
+    with open(args.path, 'r', encoding='utf-8', newline='') as f:
+        rows = contact_io.READERS[contact_io.detect_format(args.path)](f)
+        summary = validate_and_dedupe(rows, report_path, args.workers)
+    print(f"{summary['rows']} rows checked: {summary['invalid']} invalid, "
+          f"{summary['phone_clusters']} duplicate phones, {summary['name_clusters']} similar-name clusters")
+    print(f"Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import os
+import sys
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for task in sorted(os.listdir(ROOT)):
+    path = os.path.join(ROOT, task)
+    if task.startswith("Task ") and os.path.isdir(path) and path not in sys.path:
+        sys.path.insert(0, path)
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+OPERATIONS = ['1', '2', '3', '4']
+MOVES = ['rock', 'paper', 'scissors']
+QUERIES = ["ann", "smith", "jo", "maria gar", "555", "+1 555 01", "zzz", "lee"]
+FIRST = ["Ann", "John", "Maria", "Wei", "Aisha", "Carlos", "Priya", "Olga", "James", "Fatima"]
+LAST = ["Smith", "Garcia", "Lee", "Khan", "Novak", "Silva", "Patel", "Kim", "Brown", "Rossi"]
+
+
+class Skip(Exception):
+    pass
+
+
+CASES = {}
+
+
+def case(name, sizes=SIZES):
+    # Registers a context manager factory taking (size, workdir) and yielding
+    # (fn, ops): fn does the timed work, ops is how many operations it covers.
+    def register(factory):
+        CASES[name] = (contextmanager(factory), sizes)
+        return factory
+    return register
+
+
+def _journal_todo(workdir, size=0):
+    from todo_list import TodoList
+    from todo_storage import JournalStorage
+
+    storage = JournalStorage(os.path.join(workdir, "tasks.json"), compact_every=10 ** 9,
+                             compact_on_close=False)
+    todo = TodoList(storage)
+    if size:
+        with todo.batch():
+            todo.add_many((f"Task {i}", f"Description {i}", "") for i in range(size))
+    return todo
+
+
+def _contacts(count):
+    for i in range(count):
+        yield f"{FIRST[i % 10]} {LAST[i // 10 % 10]}{i}", f"+1555{i:07d}", f"user{i}@example.com", ""
+
+
+@case("todo.add_task")
+def todo_add_task(size, workdir):
+    todo = _journal_todo(workdir)
+
+    def run():
+        for i in range(size):
+            todo.add_task(f"Task {i}", "Description", "2030-01-01")
+    try:
+        yield run, size
+    finally:
+        todo.close()
+
+
+@case("todo.save_tasks")
+def todo_save_tasks(size, workdir):
+    todo = _journal_todo(workdir, size)
+    try:
+        yield todo.save_tasks, 1
+    finally:
+        todo.close()
+
+
+@case("todo.load_tasks")
+def todo_load_tasks(size, workdir):
+    todo = _journal_todo(workdir, size)
+    todo.save_tasks()
+    try:
+        yield todo.load_tasks, 1
+    finally:
+        todo.close()
+
+
+@case("todo.refresh_tasks", sizes=SIZES[:5])
+def todo_refresh_tasks(size, workdir):
+    if os.name == "posix" and sys.platform != "darwin" and not os.environ.get("DISPLAY"):
+        raise Skip("no display")
+    try:
+        import tkinter as tk
+        from Task1 import TodoApp
+    except ImportError as e:
+        raise Skip(f"tkinter unavailable: {e}")
+    todo = _journal_todo(workdir, size)
+    try:
+        app = TodoApp(todo)
+    except tk.TclError as e:
+        todo.close()
+        raise Skip(f"cannot open a Tk display: {e}")
+    app.withdraw()
+    app.update()
+
+    def run():
+        app.refresh_tasks()
+        app.update_idletasks()
+    try:
+        yield run, 1
+    finally:
+        app.destroy()
+        todo.close()
+
+
+@case("calc.perform_calculation")
+def calc_perform_calculation(size, workdir):
+    from Task2 import perform_calculation
+
+    rows = [(float(i), float(i % 97 + 1), OPERATIONS[i % 4]) for i in range(size)]
+
+    def run():
+        for num1, num2, operation in rows:
+            perform_calculation(num1, num2, operation)
+    yield run, size
+
+
+@case("password.generate_password")
+def password_generate_password(size, workdir):
+    from Task3 import generate_password
+
+    def run():
+        for _ in range(size):
+            generate_password(16)
+    yield run, size
+
+
+@case("rps.determine_winner")
+def rps_determine_winner(size, workdir):
+    from Task4 import determine_winner
+
+    rounds = [(MOVES[i % 3], MOVES[i // 3 % 3]) for i in range(size)]
+
+    def run():
+        for user_choice, computer_choice in rounds:
+            determine_winner(user_choice, computer_choice)
+    yield run, size
+
+
+@case("contacts.add_contact")
+def contacts_add_contact(size, workdir):
+    from Task5 import ContactManager
+
+    manager = ContactManager()
+    rows = list(_contacts(size))
+
+    def run():
+        for row in rows:
+            manager.add_contact(*row)
+    yield run, size
+
+
+@case("contacts.search_contacts")
+def contacts_search_contacts(size, workdir):
+    from Task5 import ContactManager
+
+    manager = ContactManager()
+    manager.import_contacts(_contacts(size))
+
+    def run():
+        for query in QUERIES:
+            manager.search_contacts(query)
+    yield run, len(QUERIES)
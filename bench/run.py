@@ -0,0 +1,182 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from timeit import default_timer
+
+from cases import CASES, SIZES, Skip
+
+MIN_TIME = 0.05
+THRESHOLD = 0.25
+
+
+def _instances(factory, size, root, count, stack):
+    runs = []
+    for _ in range(count):
+        fn, ops = stack.enter_context(factory(size, tempfile.mkdtemp(dir=root)))
+        runs.append(fn)
+    return runs, ops
+
+
+def measure(factory, size, root, repeat, min_time):
+    # Every timed call gets a freshly built instance, so cases that mutate
+    # state (add_task, add_contact) always start from the same size. Small
+    # sizes batch several instances per repeat to get above timer noise.
+    with ExitStack() as stack:
+        (fn,), ops = _instances(factory, size, root, 1, stack)
+        start = default_timer()
+        fn()
+        first = default_timer() - start
+    number = max(1, min(1000, int(min_time / max(first, 1e-9))))
+    # A single call that already fills min_time doubles as the first repeat.
+    timings = [first] if number == 1 else []
+    for _ in range(repeat - len(timings)):
+        with ExitStack() as stack:
+            runs, _ = _instances(factory, size, root, number, stack)
+            start = default_timer()
+            for fn in runs:
+                fn()
+            timings.append((default_timer() - start) / number)
+    best = min(timings)
+    return {
+        "ops": ops,
+        "number": number,
+        "repeat": repeat,
+        "best_s": best,
+        "mean_s": sum(timings) / len(timings),
+        "per_op_ns": best / ops * 1e9,
+    }
+
+
+def profile(name, factory, size, root, profile_dir):
+    import cProfile
+
+    path = os.path.join(profile_dir, f"{name}-{size}.prof")
+    with factory(size, tempfile.mkdtemp(dir=root)) as (fn, _):
+        profiler = cProfile.Profile()
+        profiler.runcall(fn)
+    profiler.dump_stats(path)
+    return path
+
+
+def peak_memory(factory, size, root):
+    import tracemalloc
+
+    with factory(size, tempfile.mkdtemp(dir=root)) as (fn, _):
+        tracemalloc.start()
+        try:
+            fn()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def run(args):
+    results = {}
+    root = tempfile.mkdtemp(prefix="bench-")
+    try:
+        for name, (factory, sizes) in CASES.items():
+            if args.only and not any(fnmatch.fnmatch(name, pattern) for pattern in args.only):
+                continue
+            results[name] = {}
+            for size in sizes:
+                if size > args.max_size or (args.sizes and size not in args.sizes):
+                    continue
+                try:
+                    result = measure(factory, size, root, args.repeat, args.min_time)
+                except Skip as e:
+                    results[name] = {"skipped": str(e)}
+                    print(f"{name:<28} skipped: {e}")
+                    break
+                if args.profile:
+                    result["profile"] = profile(name, factory, size, root, args.profile)
+                if args.tracemalloc:
+                    result["peak_bytes"] = peak_memory(factory, size, root)
+                results[name][str(size)] = result
+                line = (f"{name:<28} {size:>9}  {result['best_s'] * 1000:10.3f} ms  "
+                        f"{result['per_op_ns']:12,.0f} ns/op")
+                if "peak_bytes" in result:
+                    line += f"  peak {result['peak_bytes'] / 1024:10,.0f} KiB"
+                print(line, flush=True)
+                shutil.rmtree(root, ignore_errors=True)
+                os.makedirs(root, exist_ok=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    regressions = []
+    print(f"\n{'case':<28} {'size':>9}  {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for name, sizes in current["results"].items():
+        for size, result in sizes.items():
+            base = baseline["results"].get(name, {}).get(size)
+            if not isinstance(result, dict) or not isinstance(base, dict):
+                continue
+            change = result["best_s"] / base["best_s"] - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append((name, size, change))
+            print(f"{name:<28} {size:>9}  {base['best_s'] * 1000:12.3f} "
+                  f"{result['best_s'] * 1000:12.3f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of every task")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="run cases matching this glob, e.g. 'todo.*' (repeatable)")
+    parser.add_argument("--sizes", type=lambda s: [int(n) for n in s.split(",")],
+                        help=f"comma-separated sizes (default: {','.join(map(str, SIZES))})")
+    parser.add_argument("--max-size", type=int, default=SIZES[-1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=MIN_TIME,
+                        help="seconds each repeat should at least take")
+    parser.add_argument("--profile", metavar="DIR", help="also write a cProfile .prof file per case and size")
+    parser.add_argument("--tracemalloc", action="store_true", help="also record peak traced memory")
+    parser.add_argument("--output", metavar="JSON", help="write results to this file")
+    parser.add_argument("--baseline", metavar="JSON", help="compare against a saved run")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="slowdown fraction flagged as a regression (default: 0.25)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="only compare two saved runs")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        if args.profile:
+            os.makedirs(args.profile, exist_ok=True)
+        current = run(args)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(current, f, indent=2)
+        if not args.baseline:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())